@@ -91,6 +91,11 @@ function handleMessage(message) {
     const { type, data, message: msg } = message;
 
     switch(type) {
+        case 'batch':
+            // Several server events coalesced into one frame
+            message.events.forEach(handleMessage);
+            break;
+
         case 'connected':
             log(msg || 'Connected', 'success');
             break;
@@ -112,7 +117,10 @@ function handleMessage(message) {
             break;
 
         case 'mausezahn_stopped':
-            log(msg, 'info');
+            // The stop command's broadcast carries the message; the tool's
+            // own event carries the stats of the interrupted run
+            if (msg) log(msg, 'info');
+            if (data) updateMausezahnStats(data);
             break;
 
         case 'mausezahn_complete':
@@ -126,6 +134,10 @@ function handleMessage(message) {
             document.getElementById('mausezahn-status').style.color = '#155724';
             break;
 
+        case 'etf_configured':
+            log(msg, 'success');
+            break;
+
         case 'mausezahn_error':
             log('Mausezahn error: ' + (data.error || 'Unknown error'), 'error');
             // Reset UI
@@ -5,14 +5,23 @@ Using iperf3 and sockperf for real traffic testing
 """
 
 import logging
+import os
+import re
 import sys
+import time
 from pathlib import Path
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
 import asyncio
 import json
+import queue
+import zlib
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+import orjson
 
 # Add tools/webui to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "tools" / "webui"))
@@ -20,9 +29,9 @@ sys.path.insert(0, str(Path(__file__).parent / "tools"))
 
 from iperf3_tool import IPerf3Tool
 from sockperf_tool import SockPerfTool
-from mausezahn_tool import MausezahnTool
+from mausezahn_tool import SENDMMSG_BATCH, MausezahnTool
 from gstreamer_tool import GStreamerTool
-from network_manager import NetworkManager
+from network_manager import network_manager
 from sudo_manager import sudo_manager
 
 # Setup logging
@@ -32,22 +41,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global event loop reference
-main_loop = None
+# Ping summary patterns, matched directly against ping's raw stdout bytes
+_PING_PKT_RE = re.compile(rb'(\d+) packets transmitted, (\d+) received.*?time (\d+)ms')
+_PING_RTT_RE = re.compile(rb'rtt min/avg/max/mdev = ([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+)')
+
+# Global event loop reference, set once the server loop is running
+main_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# index.html cached at startup as (body, etag)
+_INDEX_CACHE = (b"", "")
+
+def _load_static(path: Path, fallback: str) -> tuple[bytes, str]:
+    """Read a static file once and compute its ETag"""
+    body = path.read_bytes() if path.exists() else fallback.encode()
+    # crc32 rather than md5: no crypto needed, and md5 is refused on FIPS builds
+    return body, f'"{zlib.crc32(body):08x}-{len(body):x}"'
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events"""
-    global main_loop
+    global main_loop, tool_events_ready, _INDEX_CACHE
     # Startup
+    tool_events_ready = asyncio.Event()
     main_loop = asyncio.get_running_loop()
     logger.info("Event loop stored for callbacks")
+
+    _INDEX_CACHE = _load_static(
+        Path(__file__).parent / "index.html",
+        "<h1>KETI TSN Traffic Tester</h1><p>Index page not found</p>"
+    )
+
+    network_manager.start()
+
+    drain_task = asyncio.create_task(drain_tool_events())
     yield
     # Shutdown
+    drain_task.cancel()
     logger.info("Shutting down TSN Traffic WebUI")
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+# Interactive API docs (/docs, /redoc, /openapi.json) only in debug mode
+DEBUG = os.environ.get("TSN_WEBUI_DEBUG", "").lower() in ("1", "true", "yes")
+
 # Initialize FastAPI with lifespan
-app = FastAPI(title="KETI TSN Traffic WebUI", lifespan=lifespan)
+app = FastAPI(
+    title="KETI TSN Traffic WebUI",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    docs_url="/docs" if DEBUG else None,
+    redoc_url="/redoc" if DEBUG else None,
+    openapi_url="/openapi.json" if DEBUG else None
+)
+
+# Compress HTML/JS and larger JSON responses (interface listings, stats)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Mount static files from root assets
 assets_dir = Path(__file__).parent / "assets"
@@ -66,36 +118,173 @@ iperf_tool = IPerf3Tool()
 sockperf_tool = SockPerfTool()
 mausezahn_tool = MausezahnTool()
 gstreamer_tool = GStreamerTool()
-network_manager = NetworkManager()
 
-# Active WebSocket connections
-active_connections = []
+# Active WebSocket connections and their outbound pipes
+active_connections: Dict[WebSocket, "ClientPipe"] = {}
+
+# Strong references to fire-and-forget tasks (e.g. ping) so they are not
+# garbage collected while running
+background_tasks: set[asyncio.Task] = set()
+
+def encode_message(message: dict) -> str:
+    """Encode a WebSocket message with orjson.
+
+    Messages go out as text frames since the browser client
+    JSON.parse()s event.data directly.
+    """
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+async def send_json_fast(websocket: WebSocket, message: dict):
+    """send_json() replacement using orjson.
+
+    Goes through the client's pipe when it has one so direct replies stay
+    ordered with broadcasts.
+    """
+    pipe = active_connections.get(websocket)
+    if pipe is not None:
+        pipe.push(encode_message(message))
+    else:
+        await websocket.send_text(encode_message(message))
+
+# Pre-encoded static messages
+CONNECTED_MESSAGE = encode_message({
+    "type": "connected",
+    "message": "Connected to TSN Traffic WebUI"
+})
 
 # =============================================================================
 # WebSocket Connection Manager
 # =============================================================================
 
+class ClientPipe:
+    """Per-client outbound queue drained by a dedicated writer task.
+
+    Producers only append to a deque and resolve a wake future, so a slow
+    client never delays the others. Frames that pile up while a send is
+    in flight go out together as a single "batch" frame.
+    """
+
+    # Pending frames after which a client is considered stuck and dropped
+    MAX_PENDING = 1024
+    # Close code sent to a dropped client ("Try Again Later"); the browser
+    # reconnects on close
+    DROP_CLOSE_CODE = 1013
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self._loop = asyncio.get_running_loop()
+        self._queue: deque[str] = deque()
+        self._wake = self._loop.create_future()
+        self._task = self._loop.create_task(self._writer())
+
+    def push(self, payload: str):
+        """Queue an encoded frame for sending"""
+        if len(self._queue) >= self.MAX_PENDING:
+            logger.warning("WebSocket client is not keeping up, dropping it")
+            self.close(code=self.DROP_CLOSE_CODE)
+            return
+
+        self._queue.append(payload)
+        if not self._wake.done():
+            self._wake.set_result(None)
+
+    def close(self, code: Optional[int] = None):
+        """
+        Stop the writer and forget the client
+
+        Args:
+            code: Also close the WebSocket with this code, so the receive
+                loop in websocket_endpoint ends and the client reconnects
+        """
+        active_connections.pop(self.websocket, None)
+        self._task.cancel()
+        if code is not None:
+            self._loop.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception as e:
+            logger.debug(f"WebSocket close failed: {e}")
+
+    async def _writer(self):
+        """Send queued frames until the client goes away"""
+        try:
+            while True:
+                await self._wake
+                self._wake = self._loop.create_future()
+
+                while self._queue:
+                    if len(self._queue) == 1:
+                        frame = self._queue.popleft()
+                    else:
+                        # Frames are already encoded, so batch by joining
+                        frame = '{"type":"batch","events":[' + ",".join(self._queue) + ']}'
+                        self._queue.clear()
+                    await self.websocket.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"WebSocket send failed: {e}")
+            active_connections.pop(self.websocket, None)
+            # Also end websocket_endpoint's receive loop for this client
+            await self._close_socket(self.DROP_CLOSE_CODE)
+
 async def broadcast(message: dict):
     """Broadcast message to all connected clients"""
-    for connection in active_connections:
-        try:
-            await connection.send_json(message)
-        except:
-            pass
+    if not active_connections:
+        return
+
+    # Encode once for all clients; each pipe only does an O(1) append.
+    # Snapshot since a pipe may drop itself while pushing.
+    payload = encode_message(message)
+    for pipe in list(active_connections.values()):
+        pipe.push(payload)
 
-# Store the event loop reference
-main_loop = None
+# Tool events are queued from tool threads and broadcast in batches
+tool_events: queue.SimpleQueue = queue.SimpleQueue()
+tool_events_ready: Optional[asyncio.Event] = None  # created on the running loop
+
+# Periodic updates where only the latest value matters; consecutive
+# events of these types within one batch collapse into the last one.
+# iperf3 emits "progress", sockperf "multi_size_progress"; GStreamer stats
+# are polled through get_stats rather than pushed
+COALESCED_EVENTS = {"progress", "multi_size_progress"}
 
 def tool_callback(event: str, data: dict):
-    """Callback from tools - convert to async broadcast"""
+    """Callback from tools - queue the event for the broadcast drain task"""
     if main_loop is not None:
-        asyncio.run_coroutine_threadsafe(
-            broadcast({
-                "type": event,
-                "data": data
-            }),
-            main_loop
-        )
+        tool_events.put_nowait((event, data))
+        # Only signal the loop if the drain task isn't already pending; the
+        # event is cleared before the queue is drained, so nothing is lost
+        if not tool_events_ready.is_set():
+            main_loop.call_soon_threadsafe(tool_events_ready.set)
+
+async def drain_tool_events():
+    """Broadcast queued tool events, one frame per wakeup"""
+    while True:
+        await tool_events_ready.wait()
+        tool_events_ready.clear()
+
+        events = []
+        while True:
+            try:
+                event, data = tool_events.get_nowait()
+            except queue.Empty:
+                break
+
+            if events and event in COALESCED_EVENTS and events[-1]["type"] == event:
+                events[-1]["data"] = data
+            else:
+                events.append({"type": event, "data": data})
+
+        try:
+            if len(events) == 1:
+                await broadcast(events[0])
+            elif events:
+                await broadcast({"type": "batch", "events": events})
+        except Exception as e:
+            logger.error(f"Failed to broadcast tool events: {e}")
 
 # Set callbacks
 iperf_tool.set_callback(tool_callback)
@@ -107,23 +296,51 @@ mausezahn_tool.set_callback(tool_callback)
 # Routes
 # =============================================================================
 
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client's If-None-Match already has this ETag"""
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+def _cached_response(request: Request, cache: tuple[bytes, str], media_type: str) -> Response:
+    """Serve a cached static body, answering 304 if the client's copy is current"""
+    body, etag = cache
+    headers = {"ETag": etag, "Cache-Control": STATIC_CACHE_CONTROL}
+
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type=media_type, headers=headers)
+
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Root index page"""
-    html_file = Path(__file__).parent / "index.html"
-    if html_file.exists():
-        return html_file.read_text()
-    return "<h1>KETI TSN Traffic Tester</h1><p>Index page not found</p>"
+    return _cached_response(request, _INDEX_CACHE, "text/html")
 
 @app.get("/app.js")
-async def app_js():
-    """Serve app.js from root"""
+async def app_js(request: Request):
+    """Serve app.js from root (sent straight from disk)"""
     js_file = Path(__file__).parent / "app.js"
-    if js_file.exists():
-        return HTMLResponse(content=js_file.read_text(), media_type="application/javascript")
-    return HTMLResponse(content="// app.js not found", media_type="application/javascript")
+    try:
+        stat_result = os.stat(js_file)
+    except OSError:
+        return Response(content="// app.js not found", media_type="application/javascript")
+
+    response = FileResponse(
+        js_file,
+        media_type="application/javascript",
+        headers={"Cache-Control": STATIC_CACHE_CONTROL},
+        stat_result=stat_result
+    )
+    if _not_modified(request, response.headers["etag"]):
+        return Response(status_code=304, headers={
+            "ETag": response.headers["etag"],
+            "Cache-Control": STATIC_CACHE_CONTROL
+        })
+    return response
 
-@app.get("/api/status")
+@app.get("/api/status", response_model=None)
 async def get_status():
     """Get current status"""
     return {
@@ -137,7 +354,19 @@ async def get_status():
 # Network Interface API
 # =============================================================================
 
-@app.get("/api/interfaces")
+# Pre-encoded interface listings as (body, NetworkManager.generation); the
+# manager's own TTL and netlink dirty flag decide when the list changes
+_iface_cache: tuple[bytes, int] = (b"", -1)
+_active_iface_cache: tuple[bytes, int] = (b"", -1)
+
+def _encode_interface_list(interfaces: list) -> bytes:
+    """Encode an interface listing response body"""
+    return orjson.dumps({
+        "interfaces": interfaces,
+        "count": len(interfaces)
+    }, option=orjson.OPT_NON_STR_KEYS)
+
+@app.get("/api/interfaces", response_model=None)
 async def get_interfaces(refresh: bool = False):
     """
     Get all network interfaces
@@ -145,24 +374,26 @@ async def get_interfaces(refresh: bool = False):
     Args:
         refresh: Force refresh of interface list
     """
-    if refresh:
-        interfaces = network_manager.refresh_interfaces()
-    else:
-        interfaces = network_manager.interfaces
+    global _iface_cache
+    interfaces = network_manager.refresh_interfaces(force=refresh)
+    body, generation = _iface_cache
+    if generation != network_manager.generation:
+        body = _encode_interface_list(interfaces)
+        _iface_cache = (body, network_manager.generation)
 
-    return {
-        "interfaces": interfaces,
-        "count": len(interfaces)
-    }
+    return Response(content=body, media_type="application/json")
 
-@app.get("/api/interfaces/active")
+@app.get("/api/interfaces/active", response_model=None)
 async def get_active_interfaces():
     """Get only active (up) interfaces"""
-    active = network_manager.get_active_interfaces()
-    return {
-        "interfaces": active,
-        "count": len(active)
-    }
+    global _active_iface_cache
+    network_manager.refresh_interfaces()
+    body, generation = _active_iface_cache
+    if generation != network_manager.generation:
+        body = _encode_interface_list(network_manager.get_active_interfaces())
+        _active_iface_cache = (body, network_manager.generation)
+
+    return Response(content=body, media_type="application/json")
 
 @app.get("/api/interfaces/{interface_name}")
 async def get_interface_details(interface_name: str):
@@ -174,7 +405,7 @@ async def get_interface_details(interface_name: str):
             "error": f"Interface {interface_name} not found"
         }, 404
 
-    return interface
+    return interface.to_dict()
 
 @app.get("/api/interfaces/{interface_name}/ethtool")
 async def get_interface_ethtool(interface_name: str):
@@ -206,7 +437,7 @@ async def set_interface_state(interface_name: str, data: dict):
 
     if success:
         # Refresh interface list after state change
-        network_manager.refresh_interfaces()
+        network_manager.refresh_interfaces(force=True)
         return {
             "success": True,
             "message": f"Interface {interface_name} set to {state}"
@@ -277,8 +508,13 @@ async def start_mausezahn_vlan(data: dict):
             "count": 1000,
             "delay": "1msec",
             "src_mac": "optional",
-            "dest_mac": "optional"
+            "dest_mac": "optional",
+            "use_native": false,
+            "txtime": false,
+            "batch_size": 64
         }
+
+    batch_size only applies to use_native runs with no delay ("0").
     """
     interface = data.get("interface")
     dest_ip = data.get("dest_ip")
@@ -291,6 +527,9 @@ async def start_mausezahn_vlan(data: dict):
     delay = data.get("delay", "1msec")
     src_mac = data.get("src_mac", None)
     dest_mac = data.get("dest_mac", None)
+    use_native = bool(data.get("use_native", False))
+    txtime = bool(data.get("txtime", False))
+    batch_size = int(data.get("batch_size", SENDMMSG_BATCH))
 
     if not interface or not dest_ip:
         return {"success": False, "message": "Interface and dest_ip are required"}
@@ -306,7 +545,10 @@ async def start_mausezahn_vlan(data: dict):
         count=count,
         delay=delay,
         src_mac=src_mac,
-        dest_mac=dest_mac
+        dest_mac=dest_mac,
+        use_native=use_native,
+        txtime=txtime,
+        batch_size=batch_size
     )
 
     if success:
@@ -365,7 +607,32 @@ async def stop_mausezahn():
     mausezahn_tool.stop()
     return {"success": True, "message": "Mausezahn stopped"}
 
-@app.get("/api/mausezahn/stats")
+@app.post("/api/mausezahn/etf")
+async def configure_mausezahn_etf(data: dict):
+    """
+    Install the mqprio + etf qdiscs used by txtime runs
+
+    Request body:
+        {
+            "interface": "eth0",
+            "pcp": 3,
+            "delta_ns": 500000,
+            "offload": true
+        }
+    """
+    interface = data.get("interface")
+    if not interface:
+        return {"success": False, "message": "Interface is required"}
+
+    success, message = MausezahnTool.configure_etf_qdisc(
+        interface,
+        pcp=int(data.get("pcp", 3)),
+        delta_ns=int(data.get("delta_ns", 500000)),
+        offload=bool(data.get("offload", True))
+    )
+    return {"success": success, "message": message}
+
+@app.get("/api/mausezahn/stats", response_model=None)
 async def get_mausezahn_stats():
     """Get mausezahn statistics"""
     stats = mausezahn_tool.get_stats()
@@ -387,408 +654,533 @@ async def get_mausezahn_status():
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket for real-time communication"""
     await websocket.accept()
-    active_connections.append(websocket)
+    pipe = ClientPipe(websocket)
+    active_connections[websocket] = pipe
     logger.info(f"Client connected. Total: {len(active_connections)}")
 
     try:
-        await websocket.send_json({
-            "type": "connected",
-            "message": "Connected to TSN Traffic WebUI"
-        })
+        pipe.push(CONNECTED_MESSAGE)
 
         while True:
-            data = await websocket.receive_json()
+            raw = await websocket.receive_text()
+            try:
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError as e:
+                await send_json_fast(websocket, {
+                    "type": "error",
+                    "message": f"Invalid JSON message: {e}"
+                })
+                continue
+
+            if not isinstance(data, dict):
+                await send_json_fast(websocket, {
+                    "type": "error",
+                    "message": "Message must be a JSON object"
+                })
+                continue
+
             await handle_message(websocket, data)
 
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        pipe.close()
         logger.info(f"Client disconnected. Total: {len(active_connections)}")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        pipe.close()
 
-async def handle_message(websocket: WebSocket, message: dict):
-    """Handle incoming WebSocket messages"""
-    msg_type = message.get("type")
-    data = message.get("data", {})
+# Last server status probe as (result, monotonic timestamp)
+_server_status_cache: tuple[dict, float] = ({}, 0.0)
+SERVER_STATUS_TTL = 1.0
 
+async def _pgrep(pattern: str) -> bool:
+    """Check for a running process matching pattern without blocking the loop"""
     try:
-        # iperf3 commands
-        if msg_type == "start_iperf_client":
-            host = data.get("host", "127.0.0.1")
-            port = int(data.get("port", 5201))
-            duration = int(data.get("duration", 10))
-            udp = data.get("udp", False)
-            bandwidth = data.get("bandwidth", "100M")
-
-            success = iperf_tool.start_client(
-                host=host,
-                port=port,
-                duration=duration,
-                udp=udp,
-                bandwidth=bandwidth
-            )
-
-            if success:
-                await broadcast({
-                    "type": "iperf_started",
-                    "message": f"iperf3 test started to {host}:{port}"
-                })
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Failed to start iperf3 test"
-                })
+        process = await asyncio.create_subprocess_exec(
+            'pgrep', '-f', pattern,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        return (await process.wait()) == 0
+    except Exception:
+        return False
+
+async def get_server_status() -> dict:
+    """Report whether iperf3/sockperf servers are running (cached briefly)"""
+    global _server_status_cache
+    status, timestamp = _server_status_cache
+    if time.monotonic() - timestamp < SERVER_STATUS_TTL:
+        return status
+
+    iperf_running, sockperf_running = await asyncio.gather(
+        _pgrep('iperf3.*-s'),
+        _pgrep('sockperf.*server')
+    )
+    status = {
+        "iperf_running": iperf_running,
+        "sockperf_running": sockperf_running
+    }
+    _server_status_cache = (status, time.monotonic())
+    return status
 
-        elif msg_type == "stop_iperf":
-            iperf_tool.stop()
-            await broadcast({
-                "type": "iperf_stopped",
-                "message": "iperf3 test stopped"
-            })
-
-        # sockperf commands
-        elif msg_type == "start_sockperf_pingpong":
-            host = data.get("host", "127.0.0.1")
-            port = int(data.get("port", 11111))
-            duration = int(data.get("duration", 10))
-            msg_size = int(data.get("msg_size", 64))
-
-            success = sockperf_tool.start_ping_pong(
-                host=host,
-                port=port,
-                duration=duration,
-                msg_size=msg_size
-            )
-
-            if success:
-                await broadcast({
-                    "type": "sockperf_started",
-                    "message": f"sockperf ping-pong started to {host}:{port}"
-                })
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Failed to start sockperf test"
-                })
+async def run_ping(host: str, count: int):
+    """Run ping on the event loop and broadcast the parsed statistics"""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            'ping', '-c', str(count), host,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=count + 5)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise TimeoutError(f"ping timed out after {count + 5}s")
+
+        # Parse ping output (int()/float() accept the bytes groups as-is)
+        stats = {}
+
+        # Extract statistics
+        match = _PING_PKT_RE.search(stdout)
+        if match:
+            sent = int(match.group(1))
+            received = int(match.group(2))
+            stats['packets_sent'] = sent
+            stats['packets_received'] = received
+            stats['packet_loss'] = ((sent - received) / sent * 100) if sent > 0 else 0
+
+        match = _PING_RTT_RE.search(stdout)
+        if match:
+            stats['latency_min_us'] = float(match.group(1)) * 1000
+            stats['latency_avg_us'] = float(match.group(2)) * 1000
+            stats['latency_max_us'] = float(match.group(3)) * 1000
+
+        await broadcast({
+            "type": "test_complete",
+            "data": stats
+        })
 
-        elif msg_type == "start_sockperf_load":
-            host = data.get("host", "127.0.0.1")
-            port = int(data.get("port", 11111))
-            duration = int(data.get("duration", 10))
-            msg_size = int(data.get("msg_size", 64))
-            mps = int(data.get("mps", 10000))
-
-            success = sockperf_tool.start_under_load(
-                host=host,
-                port=port,
-                duration=duration,
-                msg_size=msg_size,
-                mps=mps
-            )
-
-            if success:
-                await broadcast({
-                    "type": "sockperf_started",
-                    "message": f"sockperf under-load started to {host}:{port}"
-                })
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Failed to start sockperf test"
-                })
+    except Exception as e:
+        await broadcast({
+            "type": "error",
+            "message": f"Ping failed: {str(e)}"
+        })
 
-        elif msg_type == "stop_sockperf":
-            sockperf_tool.stop()
-            await broadcast({
-                "type": "sockperf_stopped",
-                "message": "sockperf test stopped"
-            })
-
-        elif msg_type == "start_sockperf_multisize":
-            host = data.get("host", "127.0.0.1")
-            port = int(data.get("port", 11111))
-            duration = int(data.get("duration", 10))
-            msg_sizes = data.get("msg_sizes", [64, 128, 256, 512, 1024, 1500])
-
-            success = sockperf_tool.start_multi_size_test(
-                host=host,
-                port=port,
-                duration=duration,
-                msg_sizes=msg_sizes
-            )
-
-            if success:
-                await broadcast({
-                    "type": "sockperf_multisize_started",
-                    "message": f"sockperf multi-size test started to {host}:{port}"
-                })
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Failed to start multi-size test"
-                })
+# =============================================================================
+# WebSocket Message Handlers
+# =============================================================================
 
-        # mausezahn commands
-        elif msg_type == "start_mausezahn_vlan":
-            interface = data.get("interface")
-            dest_ip = data.get("dest_ip")
-            vlan_id = int(data.get("vlan_id", 100))
-            pcp = int(data.get("pcp", 0))
-            packet_type = data.get("packet_type", "udp")
-            dest_port = int(data.get("dest_port", 5000))
-            packet_size = int(data.get("packet_size", 1000))
-            count = int(data.get("count", 1000))
-            delay = data.get("delay", "1msec")
-
-            success = mausezahn_tool.start_vlan_traffic(
-                interface=interface,
-                dest_ip=dest_ip,
-                vlan_id=vlan_id,
-                pcp=pcp,
-                packet_type=packet_type,
-                dest_port=dest_port,
-                packet_size=packet_size,
-                count=count,
-                delay=delay
-            )
-
-            if success:
-                await broadcast({
-                    "type": "mausezahn_started",
-                    "message": f"Mausezahn started on {interface} (VLAN {vlan_id}, PCP {pcp})"
-                })
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Failed to start mausezahn"
-                })
+# iperf3 commands
+async def handle_start_iperf_client(websocket: WebSocket, data: dict):
+    """Start an iperf3 client test"""
+    host = data.get("host", "127.0.0.1")
+    port = int(data.get("port", 5201))
+    duration = int(data.get("duration", 10))
+    udp = data.get("udp", False)
+    bandwidth = data.get("bandwidth", "100M")
+
+    success = iperf_tool.start_client(
+        host=host,
+        port=port,
+        duration=duration,
+        udp=udp,
+        bandwidth=bandwidth
+    )
 
-        elif msg_type == "start_mausezahn_custom":
-            interface = data.get("interface")
-            packet_hex = data.get("packet_hex")
-            vlan_id = data.get("vlan_id", None)
-            pcp = int(data.get("pcp", 0))
-            count = int(data.get("count", 1000))
-            delay = data.get("delay", "1msec")
-
-            success = mausezahn_tool.start_custom_traffic(
-                interface=interface,
-                packet_hex=packet_hex,
-                vlan_id=int(vlan_id) if vlan_id else None,
-                pcp=pcp,
-                count=count,
-                delay=delay
-            )
-
-            if success:
-                await broadcast({
-                    "type": "mausezahn_started",
-                    "message": f"Mausezahn custom traffic started on {interface}"
-                })
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Failed to start mausezahn"
-                })
+    if success:
+        await broadcast({
+            "type": "iperf_started",
+            "message": f"iperf3 test started to {host}:{port}"
+        })
+    else:
+        await send_json_fast(websocket, {
+            "type": "error",
+            "message": "Failed to start iperf3 test"
+        })
 
-        elif msg_type == "stop_mausezahn":
-            mausezahn_tool.stop()
-            await broadcast({
-                "type": "mausezahn_stopped",
-                "message": "Mausezahn stopped"
-            })
-
-        # GStreamer video streaming commands
-        elif msg_type == "start_gstreamer_sender":
-            interface = data.get("interface", "eth0")
-            dest_ip = data.get("dest_ip", "127.0.0.1")
-            dest_port = int(data.get("dest_port", 5000))
-            vlan_id = int(data.get("vlan_id", 100))
-            pcp = int(data.get("pcp", 5))
-            resolution = data.get("resolution", "640x480")
-            framerate = int(data.get("framerate", 30))
-            bitrate = int(data.get("bitrate", 2000))
-            codec = data.get("codec", "h264")
-            use_webcam = data.get("use_webcam", True)
-            device = data.get("device", "/dev/video0")
-
-            success = gstreamer_tool.start_stream(
-                interface=interface,
-                dest_ip=dest_ip,
-                dest_port=dest_port,
-                vlan_id=vlan_id,
-                pcp=pcp,
-                resolution=resolution,
-                framerate=framerate,
-                bitrate=bitrate,
-                codec=codec,
-                use_webcam=use_webcam,
-                device=device
-            )
-
-            if success:
-                await broadcast({
-                    "type": "gstreamer_started",
-                    "message": f"Video stream started to {dest_ip}:{dest_port}"
-                })
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Failed to start video stream"
-                })
+async def handle_stop_iperf(websocket: WebSocket, data: dict):
+    """Stop the running iperf3 test"""
+    iperf_tool.stop()
+    await broadcast({
+        "type": "iperf_stopped",
+        "message": "iperf3 test stopped"
+    })
+
+# sockperf commands
+async def handle_start_sockperf_pingpong(websocket: WebSocket, data: dict):
+    """Start a sockperf ping-pong latency test"""
+    host = data.get("host", "127.0.0.1")
+    port = int(data.get("port", 11111))
+    duration = int(data.get("duration", 10))
+    msg_size = int(data.get("msg_size", 64))
+
+    success = sockperf_tool.start_ping_pong(
+        host=host,
+        port=port,
+        duration=duration,
+        msg_size=msg_size
+    )
 
-        elif msg_type == "start_gstreamer_receiver":
-            port = int(data.get("port", 5000))
-            display = data.get("display", True)
-            save_file = data.get("save_file", None)
-
-            success = gstreamer_tool.start_receiver(
-                port=port,
-                display=display,
-                save_file=save_file
-            )
-
-            if success:
-                await broadcast({
-                    "type": "gstreamer_receiver_started",
-                    "message": f"Video receiver started on port {port}"
-                })
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Failed to start video receiver"
-                })
+    if success:
+        await broadcast({
+            "type": "sockperf_started",
+            "message": f"sockperf ping-pong started to {host}:{port}"
+        })
+    else:
+        await send_json_fast(websocket, {
+            "type": "error",
+            "message": "Failed to start sockperf test"
+        })
 
-        elif msg_type == "stop_gstreamer":
-            gstreamer_tool.stop_stream()
-            await broadcast({
-                "type": "gstreamer_stopped",
-                "message": "GStreamer stopped"
-            })
-
-        # Get stats
-        elif msg_type == "get_stats":
-            await websocket.send_json({
-                "type": "stats",
-                "data": {
-                    "iperf": iperf_tool.get_stats(),
-                    "sockperf": sockperf_tool.get_stats(),
-                    "mausezahn": mausezahn_tool.get_stats(),
-                    "gstreamer": gstreamer_tool.get_stats()
-                }
-            })
-
-        # Server control
-        elif msg_type == "start_server":
-            server = data.get("server", "").lower()
-            if server == "iperf3":
-                await websocket.send_json({
-                    "type": "server_started",
-                    "message": "iperf3 server should be started with: iperf3 -s -p 5201"
-                })
-            elif server == "sockperf":
-                await websocket.send_json({
-                    "type": "server_started",
-                    "message": "sockperf server should be started with: sockperf server -p 11111 -d"
-                })
+async def handle_start_sockperf_load(websocket: WebSocket, data: dict):
+    """Start a sockperf under-load latency test"""
+    host = data.get("host", "127.0.0.1")
+    port = int(data.get("port", 11111))
+    duration = int(data.get("duration", 10))
+    msg_size = int(data.get("msg_size", 64))
+    mps = int(data.get("mps", 10000))
+
+    success = sockperf_tool.start_under_load(
+        host=host,
+        port=port,
+        duration=duration,
+        msg_size=msg_size,
+        mps=mps
+    )
 
-        elif msg_type == "stop_server":
-            server = data.get("server", "").lower()
-            await websocket.send_json({
-                "type": "server_stopped",
-                "message": f"{server} server control not implemented (use system commands)"
-            })
+    if success:
+        await broadcast({
+            "type": "sockperf_started",
+            "message": f"sockperf under-load started to {host}:{port}"
+        })
+    else:
+        await send_json_fast(websocket, {
+            "type": "error",
+            "message": "Failed to start sockperf test"
+        })
 
-        elif msg_type == "get_server_status":
-            import subprocess
-            iperf_running = False
-            sockperf_running = False
+async def handle_stop_sockperf(websocket: WebSocket, data: dict):
+    """Stop the running sockperf test"""
+    sockperf_tool.stop()
+    await broadcast({
+        "type": "sockperf_stopped",
+        "message": "sockperf test stopped"
+    })
+
+async def handle_start_sockperf_multisize(websocket: WebSocket, data: dict):
+    """Start a sockperf latency sweep over several message sizes"""
+    host = data.get("host", "127.0.0.1")
+    port = int(data.get("port", 11111))
+    duration = int(data.get("duration", 10))
+    msg_sizes = data.get("msg_sizes", [64, 128, 256, 512, 1024, 1500])
+
+    success = sockperf_tool.start_multi_size_test(
+        host=host,
+        port=port,
+        duration=duration,
+        msg_sizes=msg_sizes
+    )
 
-            try:
-                result = subprocess.run(['pgrep', '-f', 'iperf3.*-s'], capture_output=True)
-                iperf_running = result.returncode == 0
-            except:
-                pass
+    if success:
+        await broadcast({
+            "type": "sockperf_multisize_started",
+            "message": f"sockperf multi-size test started to {host}:{port}"
+        })
+    else:
+        await send_json_fast(websocket, {
+            "type": "error",
+            "message": "Failed to start multi-size test"
+        })
 
-            try:
-                result = subprocess.run(['pgrep', '-f', 'sockperf.*server'], capture_output=True)
-                sockperf_running = result.returncode == 0
-            except:
-                pass
-
-            await websocket.send_json({
-                "type": "server_status",
-                "data": {
-                    "iperf_running": iperf_running,
-                    "sockperf_running": sockperf_running
-                }
-            })
-
-        # Ping
-        elif msg_type == "start_ping":
-            host = data.get("host", "127.0.0.1")
-            count = data.get("count", 10)
-
-            import subprocess
-            import threading
-
-            def run_ping():
-                try:
-                    result = subprocess.run(
-                        ['ping', '-c', str(count), host],
-                        capture_output=True,
-                        text=True,
-                        timeout=count + 5
-                    )
-
-                    # Parse ping output
-                    output = result.stdout
-                    stats = {}
-
-                    # Extract statistics
-                    import re
-                    match = re.search(r'(\d+) packets transmitted, (\d+) received.*?time (\d+)ms', output)
-                    if match:
-                        sent = int(match.group(1))
-                        received = int(match.group(2))
-                        stats['packets_sent'] = sent
-                        stats['packets_received'] = received
-                        stats['packet_loss'] = ((sent - received) / sent * 100) if sent > 0 else 0
-
-                    match = re.search(r'rtt min/avg/max/mdev = ([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+)', output)
-                    if match:
-                        stats['latency_min_us'] = float(match.group(1)) * 1000
-                        stats['latency_avg_us'] = float(match.group(2)) * 1000
-                        stats['latency_max_us'] = float(match.group(3)) * 1000
-
-                    asyncio.run(broadcast({
-                        "type": "test_complete",
-                        "data": stats
-                    }))
-
-                except Exception as e:
-                    asyncio.run(broadcast({
-                        "type": "error",
-                        "message": f"Ping failed: {str(e)}"
-                    }))
-
-            threading.Thread(target=run_ping, daemon=True).start()
-            await websocket.send_json({
-                "type": "ping_started",
-                "message": f"Ping started to {host} ({count} packets)"
-            })
-
-        elif msg_type == "stop_ping":
-            await websocket.send_json({
-                "type": "ping_stopped",
-                "message": "Ping stopped"
-            })
+# mausezahn commands
+async def handle_start_mausezahn_vlan(websocket: WebSocket, data: dict):
+    """Start VLAN-tagged packet generation"""
+    interface = data.get("interface")
+    dest_ip = data.get("dest_ip")
+    vlan_id = int(data.get("vlan_id", 100))
+    pcp = int(data.get("pcp", 0))
+    packet_type = data.get("packet_type", "udp")
+    dest_port = int(data.get("dest_port", 5000))
+    packet_size = int(data.get("packet_size", 1000))
+    count = int(data.get("count", 1000))
+    delay = data.get("delay", "1msec")
+    use_native = bool(data.get("use_native", False))
+    txtime = bool(data.get("txtime", False))
+    batch_size = int(data.get("batch_size", SENDMMSG_BATCH))
 
+    success = mausezahn_tool.start_vlan_traffic(
+        interface=interface,
+        dest_ip=dest_ip,
+        vlan_id=vlan_id,
+        pcp=pcp,
+        packet_type=packet_type,
+        dest_port=dest_port,
+        packet_size=packet_size,
+        count=count,
+        delay=delay,
+        use_native=use_native,
+        txtime=txtime,
+        batch_size=batch_size
+    )
+
+    if success:
+        await broadcast({
+            "type": "mausezahn_started",
+            "message": f"Mausezahn started on {interface} (VLAN {vlan_id}, PCP {pcp})"
+        })
+    else:
+        await send_json_fast(websocket, {
+            "type": "error",
+            "message": "Failed to start mausezahn"
+        })
+
+async def handle_start_mausezahn_custom(websocket: WebSocket, data: dict):
+    """Start packet generation from custom hex data"""
+    interface = data.get("interface")
+    packet_hex = data.get("packet_hex")
+    vlan_id = data.get("vlan_id", None)
+    pcp = int(data.get("pcp", 0))
+    count = int(data.get("count", 1000))
+    delay = data.get("delay", "1msec")
+
+    success = mausezahn_tool.start_custom_traffic(
+        interface=interface,
+        packet_hex=packet_hex,
+        vlan_id=int(vlan_id) if vlan_id else None,
+        pcp=pcp,
+        count=count,
+        delay=delay
+    )
+
+    if success:
+        await broadcast({
+            "type": "mausezahn_started",
+            "message": f"Mausezahn custom traffic started on {interface}"
+        })
+    else:
+        await send_json_fast(websocket, {
+            "type": "error",
+            "message": "Failed to start mausezahn"
+        })
+
+async def handle_stop_mausezahn(websocket: WebSocket, data: dict):
+    """Stop mausezahn packet generation"""
+    mausezahn_tool.stop()
+    await broadcast({
+        "type": "mausezahn_stopped",
+        "message": "Mausezahn stopped"
+    })
+
+# GStreamer video streaming commands
+async def handle_start_gstreamer_sender(websocket: WebSocket, data: dict):
+    """Start a GStreamer video stream"""
+    interface = data.get("interface", "eth0")
+    dest_ip = data.get("dest_ip", "127.0.0.1")
+    dest_port = int(data.get("dest_port", 5000))
+    vlan_id = int(data.get("vlan_id", 100))
+    pcp = int(data.get("pcp", 5))
+    resolution = data.get("resolution", "640x480")
+    framerate = int(data.get("framerate", 30))
+    bitrate = int(data.get("bitrate", 2000))
+    codec = data.get("codec", "h264")
+    use_webcam = data.get("use_webcam", True)
+    device = data.get("device", "/dev/video0")
+    debug = bool(data.get("debug", False))
+    multicast = data.get("multicast", None)
+    multicast_ttl = int(data.get("multicast_ttl", 1))
+    dest_ips = data.get("dest_ips", None)
+
+    success = gstreamer_tool.start_stream(
+        interface=interface,
+        dest_ip=dest_ip,
+        dest_port=dest_port,
+        vlan_id=vlan_id,
+        pcp=pcp,
+        resolution=resolution,
+        framerate=framerate,
+        bitrate=bitrate,
+        codec=codec,
+        use_webcam=use_webcam,
+        device=device,
+        debug=debug,
+        multicast=multicast,
+        multicast_ttl=multicast_ttl,
+        dest_ips=dest_ips
+    )
+
+    if success:
+        await broadcast({
+            "type": "gstreamer_started",
+            "message": f"Video stream started to {dest_ip}:{dest_port}"
+        })
+    else:
+        await send_json_fast(websocket, {
+            "type": "error",
+            "message": "Failed to start video stream"
+        })
+
+async def handle_start_gstreamer_receiver(websocket: WebSocket, data: dict):
+    """Start a GStreamer video receiver"""
+    port = int(data.get("port", 5000))
+    display = data.get("display", True)
+    save_file = data.get("save_file", None)
+    codec = data.get("codec", "h264")
+    debug = bool(data.get("debug", False))
+    multicast = data.get("multicast", None)
+    interface = data.get("interface", None)
+    jitter_latency_ms = int(data.get("jitter_latency_ms", 10))
+
+    success = gstreamer_tool.start_receiver(
+        port=port,
+        display=display,
+        save_file=save_file,
+        codec=codec,
+        debug=debug,
+        multicast=multicast,
+        interface=interface,
+        jitter_latency_ms=jitter_latency_ms
+    )
+
+    if success:
+        await broadcast({
+            "type": "gstreamer_receiver_started",
+            "message": f"Video receiver started on port {port}"
+        })
+    else:
+        await send_json_fast(websocket, {
+            "type": "error",
+            "message": "Failed to start video receiver"
+        })
+
+async def handle_stop_gstreamer(websocket: WebSocket, data: dict):
+    """Stop GStreamer streaming/receiving"""
+    gstreamer_tool.stop_stream()
+    await broadcast({
+        "type": "gstreamer_stopped",
+        "message": "GStreamer stopped"
+    })
+
+# Get stats
+async def handle_get_stats(websocket: WebSocket, data: dict):
+    """Send current statistics of all tools"""
+    await send_json_fast(websocket, {
+        "type": "stats",
+        "data": {
+            "iperf": iperf_tool.get_stats(),
+            "sockperf": sockperf_tool.get_stats(),
+            "mausezahn": mausezahn_tool.get_stats(),
+            "gstreamer": gstreamer_tool.get_stats()
+        }
+    })
+
+# Server control
+async def handle_start_server(websocket: WebSocket, data: dict):
+    """Explain how to start an iperf3/sockperf server"""
+    server = data.get("server", "").lower()
+    if server == "iperf3":
+        await send_json_fast(websocket, {
+            "type": "server_started",
+            "message": "iperf3 server should be started with: iperf3 -s -p 5201"
+        })
+    elif server == "sockperf":
+        await send_json_fast(websocket, {
+            "type": "server_started",
+            "message": "sockperf server should be started with: sockperf server -p 11111 -d"
+        })
+
+async def handle_stop_server(websocket: WebSocket, data: dict):
+    """Server stop is not handled by the WebUI"""
+    server = data.get("server", "").lower()
+    await send_json_fast(websocket, {
+        "type": "server_stopped",
+        "message": f"{server} server control not implemented (use system commands)"
+    })
+
+async def handle_get_server_status(websocket: WebSocket, data: dict):
+    """Send iperf3/sockperf server status"""
+    await send_json_fast(websocket, {
+        "type": "server_status",
+        "data": await get_server_status()
+    })
+
+# Ping
+async def handle_start_ping(websocket: WebSocket, data: dict):
+    """Start a ping test in the background"""
+    host = data.get("host", "127.0.0.1")
+    count = int(data.get("count", 10))
+
+    task = asyncio.create_task(run_ping(host, count))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+    await send_json_fast(websocket, {
+        "type": "ping_started",
+        "message": f"Ping started to {host} ({count} packets)"
+    })
+
+async def handle_stop_ping(websocket: WebSocket, data: dict):
+    """Acknowledge a ping stop request"""
+    await send_json_fast(websocket, {
+        "type": "ping_stopped",
+        "message": "Ping stopped"
+    })
+
+async def handle_configure_etf(websocket: WebSocket, data: dict):
+    """Install the mqprio + etf qdiscs used by txtime runs"""
+    interface = data.get("interface")
+    if not interface:
+        await send_json_fast(websocket, {
+            "type": "error",
+            "message": "Interface is required"
+        })
+        return
+
+    success, message = MausezahnTool.configure_etf_qdisc(
+        interface,
+        pcp=int(data.get("pcp", 3)),
+        delta_ns=int(data.get("delta_ns", 500000)),
+        offload=bool(data.get("offload", True))
+    )
+    await send_json_fast(websocket, {
+        "type": "etf_configured" if success else "error",
+        "message": message
+    })
+
+
+# Message type -> handler, looked up once per incoming message
+MESSAGE_HANDLERS: Dict[str, Callable[[WebSocket, dict], Awaitable[None]]] = {
+    "start_iperf_client": handle_start_iperf_client,
+    "stop_iperf": handle_stop_iperf,
+    "start_sockperf_pingpong": handle_start_sockperf_pingpong,
+    "start_sockperf_load": handle_start_sockperf_load,
+    "stop_sockperf": handle_stop_sockperf,
+    "start_sockperf_multisize": handle_start_sockperf_multisize,
+    "start_mausezahn_vlan": handle_start_mausezahn_vlan,
+    "start_mausezahn_custom": handle_start_mausezahn_custom,
+    "stop_mausezahn": handle_stop_mausezahn,
+    "configure_etf": handle_configure_etf,
+    "start_gstreamer_sender": handle_start_gstreamer_sender,
+    "start_gstreamer_receiver": handle_start_gstreamer_receiver,
+    "stop_gstreamer": handle_stop_gstreamer,
+    "get_stats": handle_get_stats,
+    "start_server": handle_start_server,
+    "stop_server": handle_stop_server,
+    "get_server_status": handle_get_server_status,
+    "start_ping": handle_start_ping,
+    "stop_ping": handle_stop_ping
+}
+
+async def handle_message(websocket: WebSocket, message: dict):
+    """Handle incoming WebSocket messages"""
+    handler = MESSAGE_HANDLERS.get(message.get("type"))
+    if handler is None:
+        return
+
+    try:
+        await handler(websocket, message.get("data", {}))
     except Exception as e:
         logger.error(f"Error handling message: {e}")
-        await websocket.send_json({
+        await send_json_fast(websocket, {
             "type": "error",
             "message": str(e)
         })
@@ -805,15 +1197,69 @@ if __name__ == "__main__":
     parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", type=int, default=9000)
     parser.add_argument("--reload", action="store_true")
+    parser.add_argument("--loop", choices=["auto", "uvloop", "uring", "asyncio"], default="auto",
+                        help="Event loop implementation (uring = io_uring via uringcore, Linux only)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes. Tool state and WebSocket broadcasts are per worker, "
+                             "so keep 1 unless only the stateless HTTP API needs to scale")
 
     args = parser.parse_args()
 
+    loop = args.loop
+    if loop == "uring":
+        # Completion-based io_uring loop. uvicorn must not install its own
+        # loop policy on top of it, hence loop="none". SQPOLL is left off
+        # (default completion processing) as it regresses networking loads.
+        try:
+            import uringcore
+            asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+            loop = "none"
+        except ImportError:
+            logger.warning("uringcore not installed, falling back to auto loop selection")
+            loop = "auto"
+
+    if loop == "auto":
+        # Use uvloop (libuv-based event loop) when available, otherwise fall
+        # back to the default asyncio loop (e.g. on Windows)
+        try:
+            import uvloop  # noqa: F401
+            loop = "uvloop"
+        except ImportError:
+            loop = "asyncio"
+
+    # C-accelerated HTTP parser and the websockets WS implementation
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+
+    try:
+        import websockets  # noqa: F401
+        ws = "websockets"
+    except ImportError:
+        ws = "auto"
+
+    workers = 1 if args.reload else max(1, args.workers)
+    if workers > 1:
+        logger.warning(f"Running {workers} workers: tool state and WebSocket clients "
+                       "are not shared between worker processes")
+        if loop == "none":
+            logger.warning("--loop uring only applies to the main process; workers use asyncio")
+
     logger.info(f"Starting TSN Traffic WebUI on {args.host}:{args.port}")
+    logger.info(f"Event loop: {args.loop if loop == 'none' else loop}, HTTP: {http}, WebSocket: {ws}")
     logger.info("Open http://localhost:9000 in your browser")
 
     uvicorn.run(
-        app,
+        # Reload and multiple workers need an import string instead of the app object
+        "app:app" if args.reload or workers > 1 else app,
+        app_dir=str(Path(__file__).parent),
         host=args.host,
         port=args.port,
-        reload=args.reload
+        reload=args.reload,
+        workers=workers,
+        loop=loop,
+        http=http,
+        ws=ws
     )
@@ -0,0 +1,594 @@
+"""
+Netlink Helpers
+Minimal netlink message framing plus the queries the network manager needs:
+rtnetlink link/address/qdisc dumps and link state changes, the ethtool generic netlink family (Linux
+5.6+) and the ethtool driver-info ioctl, so interface details no longer
+require netifaces or spawning ethtool
+"""
+
+import ctypes
+import fcntl
+import functools
+import os
+import socket
+import struct
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# linux/netlink.h
+NETLINK_ROUTE = 0
+NETLINK_GENERIC = 16
+NLM_F_REQUEST = 0x1
+NLM_F_ACK = 0x4
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 0x2
+NLMSG_DONE = 0x3
+NLA_F_NESTED = 0x8000
+NLA_TYPE_MASK = 0x3fff
+
+# linux/rtnetlink.h, linux/if_link.h, linux/if_addr.h
+RTM_NEWLINK = 16
+RTM_GETLINK = 18
+RTM_GETADDR = 22
+RTM_GETQDISC = 38
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+IFLA_MTU = 4
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_FLAGS = 8
+IFA_F_TEMPORARY = 0x01
+RT_SCOPE_LINK = 253
+IFF_UP = 0x1
+
+# linux/pkt_sched.h, linux/pkt_cls.h
+TCA_KIND = 1
+TCA_OPTIONS = 2
+TC_H_ROOT = 0xFFFFFFFF
+TC_H_INGRESS = 0xFFFFFFF1
+TCA_TAPRIO_ATTR_PRIOMAP = 1
+TCA_TAPRIO_ATTR_SCHED_ENTRY_LIST = 2
+TCA_TAPRIO_ATTR_SCHED_BASE_TIME = 3
+TCA_TAPRIO_ATTR_SCHED_CLOCKID = 5
+TCA_TAPRIO_ATTR_ADMIN_SCHED = 7
+TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME = 8
+TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME_EXTENSION = 9
+TCA_TAPRIO_ATTR_FLAGS = 10
+TCA_TAPRIO_ATTR_TXTIME_DELAY = 11
+TCA_TAPRIO_SCHED_ENTRY = 1
+TCA_TAPRIO_SCHED_ENTRY_INDEX = 1
+TCA_TAPRIO_SCHED_ENTRY_CMD = 2
+TCA_TAPRIO_SCHED_ENTRY_GATE_MASK = 3
+TCA_TAPRIO_SCHED_ENTRY_INTERVAL = 4
+TAPRIO_CMD_NAMES = {0: 'S', 1: 'H', 2: 'R'}
+TCA_CBS_PARMS = 1
+TCA_ETF_PARMS = 1
+TC_ETF_DEADLINE_MODE_ON = 0x1
+TC_ETF_OFFLOAD_ON = 0x2
+TC_ETF_SKIP_SOCK_CHECK = 0x4
+
+# linux/genetlink.h
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+
+# linux/ethtool_netlink.h
+ETHTOOL_MSG_STRSET_GET = 1
+ETHTOOL_MSG_LINKMODES_GET = 4
+ETHTOOL_MSG_LINKSTATE_GET = 6
+ETHTOOL_MSG_FEATURES_GET = 11
+ETHTOOL_A_HEADER = 1  # request/reply header nest, attribute 1 of every message
+ETHTOOL_A_HEADER_DEV_NAME = 2
+ETHTOOL_A_HEADER_FLAGS = 3
+ETHTOOL_FLAG_COMPACT_BITSETS = 0x1
+ETHTOOL_A_STRSET_STRINGSETS = 2
+ETHTOOL_A_STRINGSETS_STRINGSET = 1
+ETHTOOL_A_STRINGSET_ID = 1
+ETHTOOL_A_STRINGSET_STRINGS = 3
+ETHTOOL_A_STRINGS_STRING = 1
+ETHTOOL_A_STRING_INDEX = 1
+ETHTOOL_A_STRING_VALUE = 2
+ETHTOOL_A_LINKMODES_AUTONEG = 2
+ETHTOOL_A_LINKMODES_SPEED = 5
+ETHTOOL_A_LINKMODES_DUPLEX = 6
+ETHTOOL_A_LINKSTATE_LINK = 2
+ETHTOOL_A_FEATURES_HW = 2
+ETHTOOL_A_FEATURES_ACTIVE = 4
+ETHTOOL_A_BITSET_VALUE = 4
+# linux/ethtool.h string set of netdev feature names
+ETH_SS_FEATURES = 4
+
+SPEED_UNKNOWN = 0xFFFFFFFF
+DUPLEX_NAMES = {0: 'Half', 1: 'Full'}
+
+# linux/sockios.h, linux/ethtool.h
+SIOCETHTOOL = 0x8946
+ETHTOOL_GDRVINFO = 0x3
+# struct ethtool_drvinfo: cmd, driver[32], version[32], fw_version[32],
+# bus_info[32], erom_version[32], reserved2[12], five __u32 counters
+DRVINFO_SIZE = 196
+IFREQ_SIZE = 40
+
+_NLMSGHDR = struct.Struct('=IHHII')
+_NLATTR = struct.Struct('=HH')
+_GENLMSGHDR = struct.Struct('=BBH')
+# struct ifinfomsg: family, pad, type, index, flags, change
+_IFINFOMSG = struct.Struct('=BxHiII')
+# struct ifaddrmsg: family, prefixlen, flags, scope, index
+_IFADDRMSG = struct.Struct('=BBBBI')
+# struct tcmsg: family, pad[3], ifindex, handle, parent, info
+_TCMSG = struct.Struct('=BxxxiIII')
+# struct tc_mqprio_qopt: num_tc, prio_tc_map[16], hw, count[16], offset[16]
+_MQPRIO_QOPT = struct.Struct('=B16BB16H16H')
+# struct tc_prio_qopt: bands, priomap[16]
+_PRIO_QOPT = struct.Struct('=i16B')
+# struct tc_cbs_qopt: offload, pad[3], hicredit, locredit, idleslope, sendslope
+_CBS_QOPT = struct.Struct('=B3xiiii')
+# struct tc_etf_qopt: delta, clockid, flags
+_ETF_QOPT = struct.Struct('=iiI')
+
+
+class Link(NamedTuple):
+    """One RTM_NEWLINK record"""
+    index: int
+    name: str
+    flags: int
+    mac: Optional[str]
+    mtu: Optional[int]
+
+
+class Addr(NamedTuple):
+    """One RTM_NEWADDR record, address left packed until it is needed"""
+    index: int
+    family: int
+    prefixlen: int
+    scope: int
+    flags: int
+    address: bytes
+
+
+class Qdisc(NamedTuple):
+    """One RTM_NEWQDISC record, handles formatted the way tc prints them"""
+    index: int
+    kind: str
+    handle: str
+    parent: str
+    options: Dict
+
+
+def nlattr(attr_type: int, payload: bytes) -> bytes:
+    """Encode one netlink attribute, padded to 4 bytes"""
+    length = _NLATTR.size + len(payload)
+    return _NLATTR.pack(length, attr_type) + payload + b'\0' * (-length % 4)
+
+
+def iter_attrs(data: bytes, offset: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """Yield (type, payload) for each attribute in data"""
+    end = len(data)
+    while offset + _NLATTR.size <= end:
+        length, attr_type = _NLATTR.unpack_from(data, offset)
+        if length < _NLATTR.size:
+            break
+        yield attr_type & NLA_TYPE_MASK, data[offset + _NLATTR.size:offset + length]
+        offset += (length + 3) & ~3
+
+
+def parse_attrs(data: bytes, offset: int = 0) -> Dict[int, bytes]:
+    """Attributes of data keyed by type (last one wins)"""
+    return dict(iter_attrs(data, offset))
+
+
+def _attr_str(payload: bytes) -> str:
+    return payload.split(b'\0', 1)[0].decode(errors='replace')
+
+
+class NetlinkSocket:
+    """
+    Request/response netlink socket
+
+    Several requests can be sent back to back and their replies collected
+    together, so a batch of queries costs one round trip.
+    """
+
+    def __init__(self, protocol: int, timeout: float = 2.0):
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, protocol)
+        self._sock.settimeout(timeout)
+        self._sock.bind((0, 0))
+        self._seq = 0
+
+    def close(self):
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def send(self, msg_type: int, payload: bytes,
+             flags: int = NLM_F_REQUEST | NLM_F_ACK) -> int:
+        """Send one message and return its sequence number"""
+        self._seq += 1
+        self._sock.send(_NLMSGHDR.pack(_NLMSGHDR.size + len(payload), msg_type,
+                                       flags, self._seq, 0) + payload)
+        return self._seq
+
+    def collect(self, seqs: Iterable[int]) -> Dict[int, Union[List[bytes], OSError]]:
+        """
+        Read replies until every request in seqs is acknowledged or done
+
+        Returns:
+            seq -> list of message payloads, or the OSError the kernel
+            returned for that request
+        """
+        pending = set(seqs)
+        replies = {seq: [] for seq in pending}
+
+        while pending:
+            data = self._sock.recv(65536)
+            offset = 0
+            while offset + _NLMSGHDR.size <= len(data):
+                length, msg_type, _, seq, _ = _NLMSGHDR.unpack_from(data, offset)
+                if length < _NLMSGHDR.size:
+                    break
+                if seq in pending:
+                    if msg_type == NLMSG_ERROR:
+                        error = -struct.unpack_from('=i', data, offset + _NLMSGHDR.size)[0]
+                        if error:
+                            replies[seq] = OSError(error, os.strerror(error))
+                        pending.discard(seq)
+                    elif msg_type == NLMSG_DONE:
+                        pending.discard(seq)
+                    else:
+                        replies[seq].append(data[offset + _NLMSGHDR.size:offset + length])
+                offset += (length + 3) & ~3
+
+        return replies
+
+    def request(self, msg_type: int, payload: bytes,
+                flags: int = NLM_F_REQUEST | NLM_F_ACK) -> List[bytes]:
+        """Send one request and return its reply payloads, raising OSError on failure"""
+        seq = self.send(msg_type, payload, flags)
+        reply = self.collect([seq])[seq]
+        if isinstance(reply, OSError):
+            raise reply
+        return reply
+
+
+class RouteNetlink(NetlinkSocket):
+    """rtnetlink client for link, address and qdisc dumps and link state changes"""
+
+    def __init__(self):
+        super().__init__(NETLINK_ROUTE)
+
+    def get_links(self) -> List[Link]:
+        """All links from one RTM_GETLINK dump, in ifindex order"""
+        links = []
+        for msg in self.request(RTM_GETLINK, _IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0),
+                                NLM_F_REQUEST | NLM_F_DUMP):
+            _, _, index, flags, _ = _IFINFOMSG.unpack_from(msg)
+            attrs = parse_attrs(msg, _IFINFOMSG.size)
+            mac = attrs.get(IFLA_ADDRESS)
+            mtu = attrs.get(IFLA_MTU)
+            links.append(Link(
+                index=index,
+                name=_attr_str(attrs.get(IFLA_IFNAME, b'')),
+                flags=flags,
+                mac=mac.hex(':') if mac else None,
+                mtu=struct.unpack_from('=I', mtu)[0] if mtu else None,
+            ))
+        return links
+
+    def set_link_up(self, index: int, up: bool):
+        """
+        Bring a link up or down with one RTM_NEWLINK
+
+        Raises:
+            OSError: From the kernel, e.g. PermissionError without CAP_NET_ADMIN
+        """
+        # change selects the flag bits to set; only IFF_UP is touched
+        self.request(RTM_NEWLINK, _IFINFOMSG.pack(socket.AF_UNSPEC, 0, index,
+                                                  IFF_UP if up else 0, IFF_UP))
+
+    def get_addrs(self) -> List[Addr]:
+        """All IPv4/IPv6 addresses from one RTM_GETADDR dump"""
+        addrs = []
+        for msg in self.request(RTM_GETADDR, _IFADDRMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0),
+                                NLM_F_REQUEST | NLM_F_DUMP):
+            family, prefixlen, flags, scope, index = _IFADDRMSG.unpack_from(msg)
+            if family not in (socket.AF_INET, socket.AF_INET6):
+                continue
+            attrs = parse_attrs(msg, _IFADDRMSG.size)
+            # IFA_LOCAL is the interface's own address; IFA_ADDRESS is the
+            # peer on point-to-point links
+            raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+            if raw is None:
+                continue
+            if IFA_FLAGS in attrs:
+                flags = struct.unpack_from('=I', attrs[IFA_FLAGS])[0]
+            addrs.append(Addr(index, family, prefixlen, scope, flags, raw))
+        return addrs
+
+    def get_qdiscs(self, index: int = 0) -> List[Qdisc]:
+        """Qdiscs from one RTM_GETQDISC dump, limited to one ifindex if given"""
+        qdiscs = []
+        for msg in self.request(RTM_GETQDISC, _TCMSG.pack(socket.AF_UNSPEC, index, 0, 0, 0),
+                                NLM_F_REQUEST | NLM_F_DUMP):
+            _, qdisc_index, handle, parent, _ = _TCMSG.unpack_from(msg)
+            # Older kernels dump every device regardless of ifindex
+            if index and qdisc_index != index:
+                continue
+            attrs = parse_attrs(msg, _TCMSG.size)
+            kind = _attr_str(attrs.get(TCA_KIND, b''))
+            decode = _QDISC_OPTIONS.get(kind)
+            options = attrs.get(TCA_OPTIONS)
+            qdiscs.append(Qdisc(
+                index=qdisc_index,
+                kind=kind,
+                handle=tc_handle(handle),
+                parent=tc_handle(parent),
+                options=decode(options) if decode and options else {},
+            ))
+        return qdiscs
+
+
+class EthtoolNetlink(NetlinkSocket):
+    """Client for the ethtool generic netlink family"""
+
+    # Resolved once per process; feature names are the same for every device
+    _family_id: Optional[int] = None
+    _feature_names: Optional[List[str]] = None
+
+    def __init__(self):
+        super().__init__(NETLINK_GENERIC)
+        try:
+            if EthtoolNetlink._family_id is None:
+                EthtoolNetlink._family_id = self._resolve_family(b'ethtool')
+        except OSError:
+            self.close()
+            raise
+
+    def _resolve_family(self, name: bytes) -> int:
+        """Look up a generic netlink family id (ENOENT if the kernel lacks it)"""
+        reply = self.request(GENL_ID_CTRL, _GENLMSGHDR.pack(CTRL_CMD_GETFAMILY, 1, 0)
+                             + nlattr(CTRL_ATTR_FAMILY_NAME, name + b'\0'))
+        attrs = parse_attrs(reply[0], _GENLMSGHDR.size)
+        return struct.unpack_from('=H', attrs[CTRL_ATTR_FAMILY_ID])[0]
+
+    def get_link_info(self, ifname: str) -> Dict:
+        """
+        Query link modes, link state and offload features in one round trip
+
+        Replies the device does not support are left out of the result.
+
+        Returns:
+            Dictionary with any of speed, duplex, auto_negotiation,
+            link_detected (ethtool's text conventions) and offload
+        """
+        dev = nlattr(ETHTOOL_A_HEADER_DEV_NAME, ifname.encode() + b'\0')
+        header = nlattr(ETHTOOL_A_HEADER | NLA_F_NESTED, dev)
+        # Features come back as bare bitmaps, named from the cached table
+        compact_header = nlattr(ETHTOOL_A_HEADER | NLA_F_NESTED, dev + nlattr(
+            ETHTOOL_A_HEADER_FLAGS, struct.pack('=I', ETHTOOL_FLAG_COMPACT_BITSETS)))
+
+        requests = {
+            ETHTOOL_MSG_LINKMODES_GET: header,
+            ETHTOOL_MSG_LINKSTATE_GET: header,
+            ETHTOOL_MSG_FEATURES_GET: compact_header,
+        }
+        if EthtoolNetlink._feature_names is None:
+            # Global string set, fetched once in the same round trip
+            requests[ETHTOOL_MSG_STRSET_GET] = nlattr(ETHTOOL_A_HEADER | NLA_F_NESTED, b'') + nlattr(
+                ETHTOOL_A_STRSET_STRINGSETS | NLA_F_NESTED,
+                nlattr(ETHTOOL_A_STRINGSETS_STRINGSET | NLA_F_NESTED,
+                       nlattr(ETHTOOL_A_STRINGSET_ID, struct.pack('=I', ETH_SS_FEATURES))))
+
+        seqs = {
+            cmd: self.send(self._family_id, _GENLMSGHDR.pack(cmd, 1, 0) + payload)
+            for cmd, payload in requests.items()
+        }
+        replies = self.collect(seqs.values())
+
+        def reply_attrs(cmd: int) -> Optional[Dict[int, bytes]]:
+            reply = replies[seqs[cmd]]
+            if isinstance(reply, OSError) or not reply:
+                return None
+            return parse_attrs(reply[0], _GENLMSGHDR.size)
+
+        info = {}
+
+        attrs = reply_attrs(ETHTOOL_MSG_LINKMODES_GET)
+        if attrs:
+            if ETHTOOL_A_LINKMODES_SPEED in attrs:
+                speed = struct.unpack_from('=I', attrs[ETHTOOL_A_LINKMODES_SPEED])[0]
+                info["speed"] = f"{speed}Mb/s" if speed != SPEED_UNKNOWN else "Unknown!"
+            if ETHTOOL_A_LINKMODES_DUPLEX in attrs:
+                info["duplex"] = DUPLEX_NAMES.get(attrs[ETHTOOL_A_LINKMODES_DUPLEX][0], "Unknown!")
+            if ETHTOOL_A_LINKMODES_AUTONEG in attrs:
+                info["auto_negotiation"] = "on" if attrs[ETHTOOL_A_LINKMODES_AUTONEG][0] else "off"
+
+        attrs = reply_attrs(ETHTOOL_MSG_LINKSTATE_GET)
+        if attrs and ETHTOOL_A_LINKSTATE_LINK in attrs:
+            info["link_detected"] = bool(attrs[ETHTOOL_A_LINKSTATE_LINK][0])
+
+        if ETHTOOL_MSG_STRSET_GET in seqs:
+            attrs = reply_attrs(ETHTOOL_MSG_STRSET_GET)
+            if attrs:
+                EthtoolNetlink._feature_names = _parse_string_set(attrs)
+
+        names = EthtoolNetlink._feature_names
+        attrs = reply_attrs(ETHTOOL_MSG_FEATURES_GET)
+        if attrs and names is not None:
+            # Changeable features default to off; active ones are on
+            offload = dict.fromkeys(_bit_names(attrs.get(ETHTOOL_A_FEATURES_HW, b''), names), False)
+            offload.update(dict.fromkeys(_bit_names(attrs.get(ETHTOOL_A_FEATURES_ACTIVE, b''), names), True))
+            info["offload"] = offload
+
+        return info
+
+
+def _parse_string_set(attrs: Dict[int, bytes]) -> List[str]:
+    """Index-ordered strings of the single string set in a STRSET_GET reply"""
+    stringset = parse_attrs(parse_attrs(attrs[ETHTOOL_A_STRSET_STRINGSETS])[ETHTOOL_A_STRINGSETS_STRINGSET])
+    strings = {}
+    for attr_type, string in iter_attrs(stringset.get(ETHTOOL_A_STRINGSET_STRINGS, b'')):
+        if attr_type == ETHTOOL_A_STRINGS_STRING:
+            string_attrs = parse_attrs(string)
+            index = struct.unpack_from('=I', string_attrs[ETHTOOL_A_STRING_INDEX])[0]
+            strings[index] = _attr_str(string_attrs.get(ETHTOOL_A_STRING_VALUE, b''))
+    return [strings.get(i, '') for i in range(max(strings, default=-1) + 1)]
+
+
+def _bit_names(bitset: bytes, names: List[str]) -> List[str]:
+    """Names of the set bits of a compact ethtool bitset"""
+    value = parse_attrs(bitset).get(ETHTOOL_A_BITSET_VALUE, b'')
+    # Array of host-order u32 words, least significant word first
+    bits = 0
+    for i, (word,) in enumerate(struct.iter_unpack('=I', value[:len(value) // 4 * 4])):
+        bits |= word << (32 * i)
+
+    # Visit only the set bits: isolate the lowest one, then clear it
+    set_names = []
+    while bits:
+        low = bits & -bits
+        index = low.bit_length() - 1
+        if index < len(names) and names[index]:
+            set_names.append(names[index])
+        bits ^= low
+    return set_names
+
+
+def tc_handle(handle: int) -> str:
+    """Format a qdisc handle or parent as tc does ("100:", "100:1", "root")"""
+    if handle == TC_H_ROOT:
+        return "root"
+    if handle == TC_H_INGRESS:
+        return "ingress"
+    major, minor = handle >> 16, handle & 0xFFFF
+    return f"{major:x}:{minor:x}" if minor else f"{major:x}:"
+
+
+def _s32(payload: bytes) -> int:
+    return struct.unpack_from('=i', payload)[0]
+
+
+def _u32(payload: bytes) -> int:
+    return struct.unpack_from('=I', payload)[0]
+
+
+def _s64(payload: bytes) -> int:
+    return struct.unpack_from('=q', payload)[0]
+
+
+def _prio_options(data: bytes) -> Dict:
+    bands, *priomap = _PRIO_QOPT.unpack_from(data)
+    return {"bands": bands, "priomap": priomap}
+
+
+def _mqprio_options(data: bytes) -> Dict:
+    fields = _MQPRIO_QOPT.unpack_from(data)
+    num_tc, prio_tc_map, hw = fields[0], list(fields[1:17]), fields[17]
+    count, offset = fields[18:34], fields[34:50]
+    return {
+        "num_tc": num_tc,
+        "map": prio_tc_map,
+        "queues": [{"offset": offset[tc], "count": count[tc]} for tc in range(num_tc)],
+        "hw": hw,
+    }
+
+
+def _taprio_schedule(attrs: Dict[int, bytes]) -> Dict:
+    """Base time, cycle and gate control list of one taprio schedule"""
+    schedule = {}
+    if TCA_TAPRIO_ATTR_SCHED_BASE_TIME in attrs:
+        schedule["base_time"] = _s64(attrs[TCA_TAPRIO_ATTR_SCHED_BASE_TIME])
+    if TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME in attrs:
+        schedule["cycle_time"] = _s64(attrs[TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME])
+    if TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME_EXTENSION in attrs:
+        schedule["cycle_time_extension"] = _s64(attrs[TCA_TAPRIO_ATTR_SCHED_CYCLE_TIME_EXTENSION])
+
+    entries = []
+    for attr_type, entry in iter_attrs(attrs.get(TCA_TAPRIO_ATTR_SCHED_ENTRY_LIST, b'')):
+        if attr_type != TCA_TAPRIO_SCHED_ENTRY:
+            continue
+        entry_attrs = parse_attrs(entry)
+        cmd = entry_attrs.get(TCA_TAPRIO_SCHED_ENTRY_CMD, b'\0')[0]
+        entries.append({
+            "index": _u32(entry_attrs.get(TCA_TAPRIO_SCHED_ENTRY_INDEX, b'\0' * 4)),
+            "cmd": TAPRIO_CMD_NAMES.get(cmd, cmd),
+            "gatemask": hex(_u32(entry_attrs.get(TCA_TAPRIO_SCHED_ENTRY_GATE_MASK, b'\0' * 4))),
+            "interval": _u32(entry_attrs.get(TCA_TAPRIO_SCHED_ENTRY_INTERVAL, b'\0' * 4)),
+        })
+    schedule["schedule"] = entries
+    return schedule
+
+
+def _taprio_options(data: bytes) -> Dict:
+    attrs = parse_attrs(data)
+    options = {}
+    if TCA_TAPRIO_ATTR_PRIOMAP in attrs:
+        options.update(_mqprio_options(attrs[TCA_TAPRIO_ATTR_PRIOMAP]))
+    if TCA_TAPRIO_ATTR_SCHED_CLOCKID in attrs:
+        options["clockid"] = _s32(attrs[TCA_TAPRIO_ATTR_SCHED_CLOCKID])
+    if TCA_TAPRIO_ATTR_FLAGS in attrs:
+        options["flags"] = hex(_u32(attrs[TCA_TAPRIO_ATTR_FLAGS]))
+    if TCA_TAPRIO_ATTR_TXTIME_DELAY in attrs:
+        options["txtime_delay"] = _u32(attrs[TCA_TAPRIO_ATTR_TXTIME_DELAY])
+    # The operational schedule sits at the top level, a pending one is nested
+    options.update(_taprio_schedule(attrs))
+    if TCA_TAPRIO_ATTR_ADMIN_SCHED in attrs:
+        options["admin"] = _taprio_schedule(parse_attrs(attrs[TCA_TAPRIO_ATTR_ADMIN_SCHED]))
+    return options
+
+
+def _cbs_options(data: bytes) -> Dict:
+    attrs = parse_attrs(data)
+    if TCA_CBS_PARMS not in attrs:
+        return {}
+    offload, hicredit, locredit, idleslope, sendslope = _CBS_QOPT.unpack_from(attrs[TCA_CBS_PARMS])
+    return {"hicredit": hicredit, "locredit": locredit, "sendslope": sendslope,
+            "idleslope": idleslope, "offload": bool(offload)}
+
+
+def _etf_options(data: bytes) -> Dict:
+    attrs = parse_attrs(data)
+    if TCA_ETF_PARMS not in attrs:
+        return {}
+    delta, clockid, flags = _ETF_QOPT.unpack_from(attrs[TCA_ETF_PARMS])
+    return {"clockid": clockid, "delta": delta,
+            "offload": bool(flags & TC_ETF_OFFLOAD_ON),
+            "deadline_mode": bool(flags & TC_ETF_DEADLINE_MODE_ON),
+            "skip_sock_check": bool(flags & TC_ETF_SKIP_SOCK_CHECK)}
+
+
+# TCA_OPTIONS decoders for the qdiscs TSN setups use
+_QDISC_OPTIONS = {
+    'pfifo_fast': _prio_options,
+    'prio': _prio_options,
+    'mqprio': _mqprio_options,
+    'taprio': _taprio_options,
+    'cbs': _cbs_options,
+    'etf': _etf_options,
+}
+
+
+@functools.lru_cache(maxsize=33)
+def prefix_to_netmask(prefixlen: int) -> str:
+    """Dotted IPv4 netmask for a prefix length"""
+    return socket.inet_ntoa(struct.pack('!I', (0xFFFFFFFF << (32 - prefixlen)) & 0xFFFFFFFF))
+
+
+def get_drvinfo(ifname: str) -> Dict[str, str]:
+    """Driver name, version, firmware and bus info (ETHTOOL_GDRVINFO ioctl)"""
+    buf = ctypes.create_string_buffer(struct.pack('=I', ETHTOOL_GDRVINFO), DRVINFO_SIZE)
+    ifreq = struct.pack('16sP', ifname[:15].encode(), ctypes.addressof(buf)).ljust(IFREQ_SIZE, b'\0')
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        fcntl.ioctl(s.fileno(), SIOCETHTOOL, ifreq)
+
+    raw = buf.raw
+    return {
+        "driver": _attr_str(raw[4:36]),
+        "version": _attr_str(raw[36:68]),
+        "firmware": _attr_str(raw[68:100]),
+        "bus_info": _attr_str(raw[100:132]),
+    }
@@ -0,0 +1,159 @@
+"""
+Shared Child Process Reaper
+One thread waits for the exit of every child process started by the tool
+wrappers, using pidfds multiplexed through epoll
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import selectors
+import subprocess
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _dispatch(process: subprocess.Popen, callback: Callable):
+    """Reap process and hand its exit status to callback"""
+    returncode = process.wait()
+    try:
+        callback(returncode)
+    except Exception as e:
+        logger.error(f"Process exit callback error: {e}")
+
+
+def _notify_timeout(on_timeout: Optional[Callable]):
+    if on_timeout is not None:
+        try:
+            on_timeout()
+        except Exception as e:
+            logger.error(f"Process timeout callback error: {e}")
+
+
+class Reaper:
+    """
+    Runs a callback when a watched child process exits
+
+    A single thread waits on an epoll set of pidfds (Linux 5.3+), so the
+    number of threads does not grow with the number of running tools. It
+    deliberately does not use waitpid(-1), which would also reap children
+    of unrelated subprocess.run()/Popen.wait() callers.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._selector = selectors.EpollSelector()
+        # (deadline, seq, pidfd, process, on_timeout) for watches with a timeout
+        self._deadlines = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        # Self-pipe to wake select() when a sooner deadline is added
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        threading.Thread(target=self._run, name='tool-reaper', daemon=True).start()
+
+    @classmethod
+    def register(cls, process: subprocess.Popen, callback: Callable,
+                 timeout: Optional[float] = None,
+                 on_timeout: Optional[Callable] = None):
+        """
+        Call callback(returncode) from the reaper thread once process exits
+
+        Args:
+            process: Child process to watch
+            callback: Called with the exit status
+            timeout: Kill the process after this many seconds
+            on_timeout: Called just before a timed-out process is killed,
+                so the exit callback can tell a timeout from other signals
+        """
+        with cls._instance_lock:
+            if cls._instance is None and hasattr(os, 'pidfd_open'):
+                try:
+                    cls._instance = cls()
+                except OSError:
+                    # No epoll on this platform
+                    pass
+
+        if cls._instance is not None:
+            try:
+                cls._instance._watch(process, callback, timeout, on_timeout)
+                return
+            except OSError:
+                # Kernel without pidfd support
+                pass
+
+        threading.Thread(
+            target=cls._wait_thread,
+            args=(process, callback, timeout, on_timeout),
+            daemon=True
+        ).start()
+
+    @staticmethod
+    def _wait_thread(process: subprocess.Popen, callback: Callable,
+                     timeout: Optional[float], on_timeout: Optional[Callable]):
+        """Fallback: block in a dedicated thread until process exits"""
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Process {process.pid} timed out, killing it")
+            _notify_timeout(on_timeout)
+            process.kill()
+        _dispatch(process, callback)
+
+    def _watch(self, process: subprocess.Popen, callback: Callable,
+               timeout: Optional[float], on_timeout: Optional[Callable]):
+        pidfd = os.pidfd_open(process.pid)
+        self._selector.register(pidfd, selectors.EVENT_READ, (process, callback))
+
+        if timeout is not None:
+            with self._lock:
+                heapq.heappush(self._deadlines,
+                               (time.monotonic() + timeout, next(self._seq), pidfd,
+                                process, on_timeout))
+            os.write(self._wake_w, b'\0')
+
+    def _next_timeout(self) -> Optional[float]:
+        """Seconds until the nearest deadline, killing expired processes"""
+        with self._lock:
+            while self._deadlines:
+                deadline, _, pidfd, process, on_timeout = self._deadlines[0]
+                try:
+                    key = self._selector.get_key(pidfd)
+                except KeyError:
+                    key = None
+                if key is None or key.data[0] is not process:
+                    # Already exited (the fd number may have been reused)
+                    heapq.heappop(self._deadlines)
+                    continue
+
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    return remaining
+
+                heapq.heappop(self._deadlines)
+                logger.warning(f"Process {process.pid} timed out, killing it")
+                _notify_timeout(on_timeout)
+                process.kill()
+        return None
+
+    def _run(self):
+        while True:
+            for key, _ in self._selector.select(self._next_timeout()):
+                if key.fd == self._wake_r:
+                    try:
+                        os.read(self._wake_r, 4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+
+                self._selector.unregister(key.fd)
+                os.close(key.fd)
+                process, callback = key.data
+                _dispatch(process, callback)
@@ -3,29 +3,213 @@ GStreamer Video Streaming Tool for TSN Traffic Testing
 Provides webcam streaming with VLAN/PCP tagging for low-latency testing
 """
 
+import functools
+import ipaddress
+import shutil
 import subprocess
+import sys
 import threading
 import time
 import logging
-from typing import Optional, Callable
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Optional, Callable, List, Tuple, Union
 import re
 
+from _reaper import Reaper
+
 logger = logging.getLogger(__name__)
 
+# Run pipelines in-process through PyGObject when it is installed; fall back
+# to spawning gst-launch-1.0 otherwise
+try:
+    import gi
+    gi.require_version('Gst', '1.0')
+    from gi.repository import Gst, GLib
+    Gst.init(None)
+except (ImportError, ValueError):
+    Gst = None
+    GLib = None
+
+# Shared GLib main loop that dispatches bus messages for all
+# in-process pipelines
+_glib_loop = None
+_glib_loop_lock = threading.Lock()
+
+
+def _ensure_glib_loop():
+    """Start the shared GLib main loop thread on first use"""
+    global _glib_loop
+    with _glib_loop_lock:
+        if _glib_loop is None:
+            _glib_loop = GLib.MainLoop()
+            threading.Thread(target=_glib_loop.run, name='glib-mainloop', daemon=True).start()
+
+
+_RES_RE = re.compile(r'^(\d{1,5})x(\d{1,5})$')
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_resolution(resolution: str) -> Tuple[int, int]:
+    """Parse 'WIDTHxHEIGHT' into (width, height); raises ValueError"""
+    match = _RES_RE.match(resolution)
+    if not match:
+        raise ValueError(f"Invalid resolution: {resolution}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def _parse_dest_ips(dest_ips) -> List[str]:
+    """Validate a dest_ips list of IPv4 addresses; raises ValueError"""
+    # A bare string would otherwise be iterated one character at a time
+    if not isinstance(dest_ips, list) or not dest_ips:
+        raise ValueError(f"dest_ips must be a non-empty list of IP addresses, got {dest_ips!r}")
+    if not all(isinstance(ip, str) for ip in dest_ips):
+        raise ValueError(f"dest_ips must contain strings, got {dest_ips!r}")
+    # multiudpsink clients are "host:port", so IPv6 literals are not accepted
+    try:
+        return [str(ipaddress.IPv4Address(ip.strip())) for ip in dest_ips]
+    except ipaddress.AddressValueError as e:
+        raise ValueError(f"Invalid IPv4 address in dest_ips: {e}") from None
+
+
+# Encoders tried in priority order per codec: (element, bitrate property
+# template in kbps, extra properties). Hardware encoders (VA-API, NVENC,
+# V4L2 M2M) are preferred; the software encoder is the last resort.
+_ENCODERS = {
+    'h264': [
+        ('vaapih264enc', 'bitrate={kbps}', ['rate-control=cbr']),
+        ('nvh264enc', 'bitrate={kbps}', ['rc-mode=cbr', 'preset=low-latency-hq', 'zerolatency=true']),
+        ('v4l2h264enc', 'extra-controls=encode,video_bitrate={bps}', []),
+        ('x264enc', 'bitrate={kbps}', ['tune=zerolatency', 'speed-preset=ultrafast']),
+    ],
+    'h265': [
+        ('vaapih265enc', 'bitrate={kbps}', ['rate-control=cbr']),
+        ('nvh265enc', 'bitrate={kbps}', ['rc-mode=cbr', 'preset=low-latency-hq', 'zerolatency=true']),
+        ('v4l2h265enc', 'extra-controls=encode,video_bitrate={bps}', []),
+        ('x265enc', 'bitrate={kbps}', ['tune=zerolatency', 'speed-preset=ultrafast']),
+    ],
+}
+
+_PAYLOADERS = {
+    'h264': 'rtph264pay',
+    'h265': 'rtph265pay',
+}
+
+# codec -> (RTP encoding-name, depayloader, parser)
+_DEPAYLOADERS = {
+    'h264': ('H264', 'rtph264depay', 'h264parse'),
+    'h265': ('H265', 'rtph265depay', 'h265parse'),
+}
+
+# Decoders tried in priority order per codec: (element, display sink
+# tokens). Hardware decoders feed a sink that consumes their output memory
+# (VA surfaces, GL/CUDA memory, DMA-BUF) directly, so decoded frames are
+# not copied through system memory and no videoconvert is needed.
+_DECODERS = {
+    'h264': [
+        ('vaapih264dec', ['vaapisink']),
+        ('nvh264dec', ['glimagesink']),
+        ('v4l2h264dec', ['glimagesink']),
+        ('avdec_h264', ['videoconvert', '!', 'autovideosink']),
+    ],
+    'h265': [
+        ('vaapih265dec', ['vaapisink']),
+        ('nvh265dec', ['glimagesink']),
+        ('v4l2h265dec', ['glimagesink']),
+        ('avdec_h265', ['videoconvert', '!', 'autovideosink']),
+    ],
+}
+
+
+# Number of GStreamer stderr lines kept for the exit log
+STDERR_TAIL_LINES = 20
+
+# Receiver jitter buffer latency; a small budget suited to TSN streams
+JITTER_LATENCY_MS = 10
+
+# Minimum age of a running stream's stats snapshot before get_stats()
+# republishes it
+STATS_REFRESH_INTERVAL = 1.0
+
+
+# Socket buffer sizes for udpsink/udpsrc (SO_SNDBUF/SO_RCVBUF); the kernel
+# default (~212 KB) drops packets during I-frame bursts
+SEND_BUFFER_BYTES = 2 * 1024 * 1024
+RECV_BUFFER_BYTES = 8 * 1024 * 1024
+
+
+# __slots__ for the stats records where dataclasses support it (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class StreamStats:
+    """Sender statistics; replaced, never mutated, once published"""
+    duration: float = 0.0
+    bitrate: int = 0
+    fps: int = 0
+    resolution: str = ''
+    codec: str = ''
+    encoder: str = ''
+    vlan_id: int = 0
+    pcp: int = 0
+    packets_sent: int = 0
+    packets_received: int = 0
+    packets_lost: int = 0
+    packet_loss: float = 0.0
+    jitter: float = 0.0  # milliseconds
+    latency: float = 0.0  # milliseconds
+
+
+@dataclass(**_SLOTS)
+class ReceiverStats:
+    """Receiver statistics; replaced, never mutated, once published"""
+    duration: float = 0.0
+    port: int = 0
+    mode: str = 'receiver'
+    decoder: str = ''
+    packets_lost: int = 0
+    jitter: float = 0.0  # milliseconds
+
+
+def _check_socket_buffer_limit(sysctl: str, requested: int):
+    """Warn if net.core.<sysctl> caps the requested socket buffer size"""
+    try:
+        with open(f'/proc/sys/net/core/{sysctl}') as f:
+            limit = int(f.read())
+    except (OSError, ValueError):
+        return
+
+    if limit < requested:
+        logger.warning(
+            f"net.core.{sysctl}={limit} is below the requested socket buffer "
+            f"size {requested}; raise it with 'sudo sysctl -w net.core.{sysctl}={requested}'"
+        )
+
 
 class GStreamerTool:
     """Wrapper for GStreamer video streaming with TSN support"""
 
+    # codec -> selected encoder/decoder entry, probed once per process
+    _encoder_cache = {}
+    _decoder_cache = {}
+    # Cached check_available() result
+    _avail: Optional[bool] = None
+
     def __init__(self):
         self.process = None
-        self.thread = None
+        self.pipeline = None
         self.is_running = False
-        self.stats = {
-            'duration': 0,
-            'bitrate': 0,
-            'fps': 0,
-            'resolution': ''
-        }
+        self._pipeline_lock = threading.Lock()
+        self._bus_handlers = []
+        self._t0_ns = 0
+        self._stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+        self._stderr_reader = None
+        # Updated with dataclasses.replace() so a published record never
+        # changes under a reader
+        self.stats: Union[StreamStats, ReceiverStats] = StreamStats()
+        self._stats_snapshot = self.stats
+        self._snapshot_time = 0.0
         self.callback = None
 
     def set_callback(self, callback: Callable):
@@ -51,7 +235,12 @@ class GStreamerTool:
                      bitrate: int = 2000,
                      codec: str = "h264",
                      use_webcam: bool = True,
-                     device: str = "/dev/video0") -> bool:
+                     device: str = "/dev/video0",
+                     socket_buf_bytes: int = SEND_BUFFER_BYTES,
+                     debug: bool = False,
+                     multicast: Optional[str] = None,
+                     multicast_ttl: int = 1,
+                     dest_ips: Optional[List[str]] = None) -> bool:
         """
         Start video streaming
 
@@ -64,23 +253,44 @@ class GStreamerTool:
             resolution: Video resolution (e.g., "640x480", "1280x720")
             framerate: Frames per second
             bitrate: Encoding bitrate in kbps
-            codec: Video codec ("h264", "h265", "vp8", "vp9")
+            codec: Video codec ("h264", "h265")
             use_webcam: Use real webcam (True) or test pattern (False)
             device: Webcam device path (e.g., /dev/video0)
+            socket_buf_bytes: udpsink send buffer size (needs net.core.wmem_max >= this)
+            debug: Capture gst-launch-1.0 stderr for the exit log
+            multicast: Multicast group to send to instead of dest_ip
+            multicast_ttl: Multicast TTL (1 keeps traffic on the local segment)
+            dest_ips: Several unicast receivers (list of IPv4 addresses) fed
+                from the same encode
+
+        A multicast group or dest_ips list fans one encoded stream out to
+        many receivers, instead of running one encoder per receiver.
         """
         if self.is_running:
             logger.warning("GStreamer already running")
             return False
 
         try:
-            width, height = resolution.split('x')
-            width, height = int(width), int(height)
-        except:
+            width, height = _parse_resolution(resolution)
+        except ValueError:
             logger.error(f"Invalid resolution: {resolution}")
             return False
 
+        if dest_ips is not None and not multicast:
+            try:
+                dest_ips = _parse_dest_ips(dest_ips)
+            except ValueError as e:
+                logger.error(f"Invalid dest_ips: {e}")
+                self._notify('gstreamer_error', {'error': str(e)})
+                return False
+
+        if codec not in _ENCODERS:
+            logger.warning(f"Unsupported codec {codec}, using h264")
+            codec = 'h264'
+        encoder, bitrate_prop, encoder_props = self._pick_encoder(codec)
+
         # Build GStreamer pipeline for video streaming
-        pipeline = ['gst-launch-1.0', '-v']
+        pipeline = []
 
         if use_webcam:
             # Real webcam source
@@ -95,145 +305,319 @@ class GStreamerTool:
                 '!', f'video/x-raw,width={width},height={height},framerate={framerate}/1'
             ])
 
+        if multicast:
+            # One send to the group; the network replicates it
+            sink = ['udpsink', f'host={multicast}', f'port={dest_port}',
+                    'auto-multicast=true', f'ttl-mc={multicast_ttl}',
+                    f'multicast-iface={interface}']
+            dest = f'{multicast}:{dest_port}'
+        elif dest_ips:
+            # One sink socket sends every RTP packet to each client
+            dest = ','.join(f'{ip}:{dest_port}' for ip in dest_ips)
+            sink = ['multiudpsink', f'clients={dest}']
+        else:
+            sink = ['udpsink', f'host={dest_ip}', f'port={dest_port}']
+            dest = f'{dest_ip}:{dest_port}'
+
         # Encoder and network sink
         pipeline.extend([
             '!', 'videoconvert',
-            '!', 'x264enc', f'bitrate={bitrate}', 'tune=zerolatency', 'speed-preset=ultrafast',
-            '!', 'rtph264pay',
-            '!', 'udpsink', f'host={dest_ip}', f'port={dest_port}'
+            '!', encoder, bitrate_prop.format(kbps=bitrate, bps=bitrate * 1000), *encoder_props,
+            '!', _PAYLOADERS[codec],
+            '!', *sink, f'buffer-size={socket_buf_bytes}',
+            # Send packets as the encoder produces them instead of
+            # re-pacing them against the pipeline clock
+            'sync=false'
         ])
+        _check_socket_buffer_limit('wmem_max', socket_buf_bytes)
 
         logger.info(f"Starting GStreamer: {' '.join(pipeline)}")
 
-        try:
-            self.process = subprocess.Popen(
-                pipeline,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-
+        def announce():
             self.is_running = True
-            self.stats = {
-                'duration': 0,
-                'bitrate': bitrate,
-                'fps': framerate,
-                'resolution': resolution,
-                'codec': codec,
-                'vlan_id': vlan_id,
-                'pcp': pcp
-            }
-
-            # Start monitoring thread
-            self.thread = threading.Thread(
-                target=self._monitor_stream,
-                daemon=True
+            self.stats = StreamStats(
+                bitrate=bitrate,
+                fps=framerate,
+                resolution=resolution,
+                codec=codec,
+                encoder=encoder,
+                vlan_id=vlan_id,
+                pcp=pcp
             )
-            self.thread.start()
+
+            self._publish_stats()
 
             self._notify('gstreamer_started', {
                 'resolution': resolution,
                 'framerate': framerate,
                 'bitrate': bitrate,
-                'dest': f'{dest_ip}:{dest_port}'
+                'dest': dest
             })
 
+        try:
+            self._launch(pipeline, debug, announce)
+
+            # Watch for exit only after announcing the start
+            self._start_monitor()
+
             return True
 
         except Exception as e:
             logger.error(f"Failed to start GStreamer: {e}")
+            self.is_running = False
             self._notify('gstreamer_error', {'error': str(e)})
             return False
 
+    @classmethod
+    def _pick_encoder(cls, codec: str) -> tuple:
+        """Return the first available encoder entry for codec (cached)"""
+        if codec not in cls._encoder_cache:
+            chosen = cls._first_available(_ENCODERS[codec])
+            logger.info(f"Using {chosen[0]} for {codec} encoding")
+            cls._encoder_cache[codec] = chosen
+        return cls._encoder_cache[codec]
+
+    @classmethod
+    def _pick_decoder(cls, codec: str) -> tuple:
+        """Return the first available decoder entry for codec (cached)"""
+        if codec not in cls._decoder_cache:
+            chosen = cls._first_available(_DECODERS[codec])
+            logger.info(f"Using {chosen[0]} for {codec} decoding")
+            cls._decoder_cache[codec] = chosen
+        return cls._decoder_cache[codec]
+
+    @classmethod
+    def _first_available(cls, candidates: list) -> tuple:
+        """First candidate whose element exists; the last one is the fallback"""
+        for entry in candidates[:-1]:
+            if cls._element_available(entry[0]):
+                return entry
+        return candidates[-1]
+
+    @staticmethod
+    def _element_available(name: str) -> bool:
+        """Check whether a GStreamer element factory is registered"""
+        if Gst is not None:
+            return Gst.ElementFactory.find(name) is not None
+
+        try:
+            result = subprocess.run(
+                ['gst-inspect-1.0', name],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=5
+            )
+            return result.returncode == 0
+        except Exception:
+            return False
+
     def stop_stream(self) -> bool:
         """Stop video streaming"""
         if not self.is_running:
             return False
 
         try:
-            if self.process:
+            if self.pipeline is not None:
+                self._teardown_pipeline()
+            elif self.process:
                 self.process.terminate()
                 self.process.wait(timeout=5)
+            self._update_stats()
             self.is_running = False
 
-            final_stats = self.stats.copy()
-            self._notify('gstreamer_stopped', final_stats)
+            self._notify('gstreamer_stopped', self._stats_snapshot)
 
             logger.info("GStreamer stopped")
             return True
 
         except Exception as e:
             logger.error(f"Error stopping GStreamer: {e}")
-            if self.process:
+            if self.process and self.pipeline is None:
                 self.process.kill()
             self.is_running = False
             return False
 
-    def _monitor_stream(self):
-        """Monitor GStreamer process and collect RTP statistics"""
-        start_time = time.time()
-        last_stats = None
-        packet_loss_total = 0
-        packets_received = 0
+    def _launch(self, pipeline: list, debug: bool = False,
+                announce: Optional[Callable] = None):
+        """
+        Start a pipeline description
+
+        Args:
+            pipeline: gst-launch style element/property tokens
+            debug: Capture gst-launch-1.0 stderr (kept as a bounded tail)
+            announce: Sets up run state and reports the start; called once
+                the pipeline exists but before it can post EOS or errors
+        """
+        self._t0_ns = time.monotonic_ns()
+
+        if Gst is None:
+            # gst-launch-1.0 output is discarded unless debugging. An
+            # absolute executable with close_fds=False lets subprocess use
+            # posix_spawn() instead of fork()+exec().
+            self.process = subprocess.Popen(
+                ['gst-launch-1.0'] + pipeline,
+                executable=shutil.which('gst-launch-1.0') or 'gst-launch-1.0',
+                close_fds=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE if debug else subprocess.DEVNULL,
+                text=True
+            )
 
-        while self.is_running and self.process:
-            # Update duration
-            duration = time.time() - start_time
-            self.stats['duration'] = duration
+            self._stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+            self._stderr_reader = None
+            if debug:
+                # Keep only the tail of stderr instead of buffering all of it
+                self._stderr_reader = threading.Thread(
+                    target=self._read_stderr,
+                    args=(self.process.stderr, self._stderr_tail),
+                    daemon=True
+                )
+                self._stderr_reader.start()
+            if announce:
+                announce()
+            return
 
-            # Try to parse GStreamer debug output for RTP statistics
-            # This works if gst-launch-1.0 is run with -v (verbose) flag
-            try:
-                # Read stderr (GStreamer outputs stats to stderr)
-                if self.process.stderr:
-                    # Note: This is non-blocking read attempt
-                    # In production, you might want to use select() or asyncio
-                    pass
-            except:
-                pass
-
-            # Estimate metrics based on streaming parameters
-            if duration > 0:
-                # Calculate expected packets
-                if 'fps' in self.stats and 'bitrate' in self.stats:
-                    fps = self.stats.get('fps', 30)
-                    bitrate_kbps = self.stats.get('bitrate', 2000)
-
-                    # Rough estimation: packets per second
-                    # (bitrate in Kbps / 8 for bytes, / ~1400 for packet size)
-                    pps = (bitrate_kbps * 1000 / 8) / 1400
-                    expected_packets = int(pps * duration)
-
-                    # Simulate network metrics (placeholder for actual RTP stats)
-                    # In real implementation, parse rtpjitterbuffer stats
-                    self.stats['packets_sent'] = expected_packets
-                    self.stats['packets_received'] = expected_packets
-                    self.stats['packet_loss'] = 0.0
-                    self.stats['jitter'] = 0.0  # milliseconds
-                    self.stats['latency'] = 0.0  # milliseconds
-
-            # Broadcast stats update every second
-            if int(duration) % 1 == 0 and int(duration) != last_stats:
-                last_stats = int(duration)
-                self._notify('gstreamer_stats_update', self.stats)
-
-            # Check if process is still running
-            if self.process.poll() is not None:
-                logger.info("GStreamer process ended")
-                self.is_running = False
-                break
-
-            time.sleep(0.5)  # Check more frequently
-
-        # Process ended
-        if self.process:
-            stdout, stderr = self.process.communicate()
-            if stderr:
-                # Try to extract final statistics from GStreamer output
-                self._parse_gstreamer_stats(stderr)
-                logger.debug(f"GStreamer stderr: {stderr[-500:]}")  # Last 500 chars
-
-        self._notify('gstreamer_complete', self.stats)
+        self.process = None
+        self.pipeline = Gst.parse_launch(' '.join(pipeline))
+
+        bus = self.pipeline.get_bus()
+        bus.add_signal_watch()
+        self._bus_handlers = [
+            bus.connect('message::eos', self._on_bus_eos),
+            bus.connect('message::error', self._on_bus_error)
+        ]
+        _ensure_glib_loop()
+
+        if announce:
+            announce()
+
+        if self.pipeline.set_state(Gst.State.PLAYING) == Gst.StateChangeReturn.FAILURE:
+            self._teardown_pipeline()
+            raise RuntimeError("Failed to set GStreamer pipeline to PLAYING")
+
+    def _start_monitor(self):
+        """Start exit monitoring for the launched pipeline"""
+        # In-process pipelines report EOS/errors on the bus; stats are
+        # computed on demand in get_stats()
+        if self.process is not None:
+            process = self.process
+            Reaper.register(process, lambda returncode: self._on_process_exit(process, returncode))
+
+    @staticmethod
+    def _read_stderr(stream, tail: deque):
+        """Drain GStreamer stderr line by line into a bounded deque"""
+        try:
+            for line in stream:
+                tail.append(line)
+        except (OSError, ValueError):
+            pass
+
+    def _teardown_pipeline(self) -> bool:
+        """Stop and release the in-process pipeline (safe from any thread)"""
+        with self._pipeline_lock:
+            pipeline, self.pipeline = self.pipeline, None
+            handlers, self._bus_handlers = self._bus_handlers, []
+
+        if pipeline is None:
+            return False
+
+        bus = pipeline.get_bus()
+        for handler in handlers:
+            bus.disconnect(handler)
+        bus.remove_signal_watch()
+        pipeline.set_state(Gst.State.NULL)
+        return True
+
+    def _on_bus_eos(self, bus, message):
+        """Pipeline reached end of stream"""
+        logger.info("GStreamer pipeline ended")
+        self._finish_pipeline()
+
+    def _on_bus_error(self, bus, message):
+        """Pipeline reported an error"""
+        error, debug = message.parse_error()
+        logger.error(f"GStreamer error: {error.message}")
+        logger.debug(f"GStreamer error details: {debug}")
+        self._notify('gstreamer_error', {'error': error.message})
+        self._finish_pipeline()
+
+    def _finish_pipeline(self):
+        """Handle an in-process pipeline ending on its own"""
+        if self._teardown_pipeline():
+            self._update_stats()
+            self.is_running = False
+            self._notify('gstreamer_complete', self._stats_snapshot)
+
+    def _on_process_exit(self, process: subprocess.Popen, returncode: int):
+        """Handle gst-launch-1.0 exiting (reaper callback)"""
+        if process is not self.process:
+            return
+
+        logger.info(f"GStreamer process ended (exit code {returncode})")
+        if self.is_running:
+            self._update_stats()
+            self.is_running = False
+
+        if self._stderr_reader:
+            self._stderr_reader.join(timeout=1)
+        if self._stderr_tail:
+            stderr = ''.join(self._stderr_tail)
+            # Try to extract final statistics from GStreamer output
+            self._parse_gstreamer_stats(stderr)
+            logger.debug(f"GStreamer stderr: {stderr}")
+            self._publish_stats()
+
+        self._notify('gstreamer_complete', self._stats_snapshot)
+
+    def _update_stats(self):
+        """Freeze duration and estimated RTP metrics when a stream ends"""
+        duration = self._elapsed()
+        self.stats = replace(self.stats, duration=duration,
+                             **self._estimate_rtp_stats(duration))
+        self._publish_stats()
+
+    def _elapsed(self) -> float:
+        """Seconds since the stream started (monotonic clock)"""
+        return (time.monotonic_ns() - self._t0_ns) / 1e9
+
+    def _publish_stats(self) -> Union[StreamStats, ReceiverStats]:
+        """
+        Publish a stats snapshot
+
+        Readers only ever see a complete snapshot: it is swapped in with a
+        single reference assignment, so no lock or copy is needed.
+        """
+        snapshot = self.stats
+        if self.is_running:
+            duration = self._elapsed()
+            snapshot = replace(snapshot, duration=duration,
+                               **self._estimate_rtp_stats(duration))
+
+        self._stats_snapshot = snapshot
+        self._snapshot_time = time.monotonic()
+        return snapshot
+
+    def _estimate_rtp_stats(self, duration: float) -> dict:
+        """Estimate RTP metrics from the configured streaming parameters"""
+        estimates = {}
+        if duration > 0:
+            # Calculate expected packets
+            if isinstance(self.stats, StreamStats):
+                bitrate_kbps = self.stats.bitrate
+
+                # Rough estimation: packets per second
+                # (bitrate in Kbps / 8 for bytes, / ~1400 for packet size)
+                pps = (bitrate_kbps * 1000 / 8) / 1400
+                expected_packets = int(pps * duration)
+
+                # Simulate network metrics (placeholder for actual RTP stats)
+                # In real implementation, parse rtpjitterbuffer stats
+                estimates['packets_sent'] = expected_packets
+                estimates['packets_received'] = expected_packets
+                estimates['packet_loss'] = 0.0
+                estimates['jitter'] = 0.0  # milliseconds
+                estimates['latency'] = 0.0  # milliseconds
+        return estimates
 
     def _parse_gstreamer_stats(self, output: str):
         """Parse GStreamer output for RTP statistics"""
@@ -249,19 +633,27 @@ class GStreamerTool:
             # Parse packet loss
             loss_match = re.search(r'packets-lost[:\s=]+(\d+)', output)
             if loss_match:
-                self.stats['packets_lost'] = int(loss_match.group(1))
+                self.stats = replace(self.stats, packets_lost=int(loss_match.group(1)))
 
             # Parse jitter (typically in milliseconds)
             jitter_match = re.search(r'jitter[:\s=]+([\d.]+)', output)
             if jitter_match:
-                self.stats['jitter'] = float(jitter_match.group(1))
+                self.stats = replace(self.stats, jitter=float(jitter_match.group(1)))
 
         except Exception as e:
             logger.debug(f"Failed to parse GStreamer stats: {e}")
 
-    def get_stats(self) -> dict:
-        """Get current streaming statistics"""
-        return self.stats.copy()
+    def get_stats(self) -> Union[StreamStats, ReceiverStats]:
+        """
+        Get current streaming statistics
+
+        Returns the published snapshot; use dataclasses.asdict() where a
+        dict is needed (orjson serializes dataclasses directly).
+        """
+        snapshot = self._stats_snapshot
+        if self.is_running and time.monotonic() - self._snapshot_time >= STATS_REFRESH_INTERVAL:
+            snapshot = self._publish_stats()
+        return snapshot
 
     def is_streaming(self) -> bool:
         """Check if streaming is active"""
@@ -270,7 +662,13 @@ class GStreamerTool:
     def start_receiver(self,
                        port: int = 5000,
                        display: bool = True,
-                       save_file: str = None) -> bool:
+                       save_file: str = None,
+                       socket_buf_bytes: int = RECV_BUFFER_BYTES,
+                       codec: str = "h264",
+                       debug: bool = False,
+                       multicast: Optional[str] = None,
+                       interface: Optional[str] = None,
+                       jitter_latency_ms: int = JITTER_LATENCY_MS) -> bool:
         """
         Start video receiver
 
@@ -278,69 +676,68 @@ class GStreamerTool:
             port: Port to receive on
             display: Display video window
             save_file: Optional file path to save video
+            socket_buf_bytes: udpsrc receive buffer size (needs net.core.rmem_max >= this)
+            codec: Stream codec ("h264", "h265"), must match the sender
+            debug: Capture gst-launch-1.0 stderr for the exit log
+            multicast: Multicast group to join
+            interface: Interface to join the multicast group on
+            jitter_latency_ms: rtpjitterbuffer latency used to reorder packets
         """
         if self.is_running:
             logger.warning("GStreamer already running")
             return False
 
+        if codec not in _DEPAYLOADERS:
+            logger.warning(f"Unsupported codec {codec}, using h264")
+            codec = 'h264'
+        encoding_name, depayloader, parser = _DEPAYLOADERS[codec]
+        decoder, display_sink = self._pick_decoder(codec)
+
         # Build GStreamer receiver pipeline
-        pipeline = ['gst-launch-1.0', '-v']
+        pipeline = []
 
         # Receive UDP RTP stream
+        pipeline.extend(['udpsrc', f'port={port}', f'buffer-size={socket_buf_bytes}'])
+        if multicast:
+            pipeline.extend([f'address={multicast}', 'auto-multicast=true'])
+            if interface:
+                pipeline.append(f'multicast-iface={interface}')
+        # Jitter buffer reorders late UDP packets before depayloading
         pipeline.extend([
-            'udpsrc', f'port={port}',
-            '!', 'application/x-rtp,encoding-name=H264,payload=96',
-            '!', 'rtph264depay',
-            '!', 'h264parse',
-            '!', 'avdec_h264'
+            '!', f'application/x-rtp,encoding-name={encoding_name},payload=96',
+            '!', 'rtpjitterbuffer', f'latency={jitter_latency_ms}', 'do-lost=true',
+            '!', depayloader,
+            '!', parser, 'config-interval=1'
         ])
+        _check_socket_buffer_limit('rmem_max', socket_buf_bytes)
 
         if save_file:
-            # Save to file
+            # Save to file: remux the received stream as-is (no decode and
+            # re-encode); decode only for the optional display branch
             pipeline.extend([
                 '!', 'tee', 'name=t',
-                't.', '!', 'queue', '!', 'videoconvert', '!', 'x264enc', '!', 'mp4mux', '!', f'filesink location={save_file}'
+                't.', '!', 'queue', '!', 'mp4mux', 'faststart=true', '!', f'filesink location={save_file}'
             ])
             if display:
-                pipeline.extend([
-                    't.', '!', 'queue', '!', 'videoconvert', '!', 'autovideosink'
-                ])
+                pipeline.extend(['t.', '!', 'queue', '!', decoder, '!', *display_sink])
         else:
             if display:
                 # Display only
-                pipeline.extend([
-                    '!', 'videoconvert',
-                    '!', 'autovideosink'
-                ])
+                pipeline.extend(['!', decoder, '!', *display_sink])
             else:
                 # Fakesink (just receive, no display)
                 pipeline.extend([
+                    '!', decoder,
                     '!', 'fakesink'
                 ])
 
         logger.info(f"Starting GStreamer receiver: {' '.join(pipeline)}")
 
-        try:
-            self.process = subprocess.Popen(
-                pipeline,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-
+        def announce():
             self.is_running = True
-            self.stats = {
-                'duration': 0,
-                'port': port,
-                'mode': 'receiver'
-            }
+            self.stats = ReceiverStats(port=port, decoder=decoder)
 
-            # Start monitoring thread
-            self.thread = threading.Thread(
-                target=self._monitor_stream,
-                daemon=True
-            )
-            self.thread.start()
+            self._publish_stats()
 
             self._notify('gstreamer_receiver_started', {
                 'port': port,
@@ -348,23 +745,23 @@ class GStreamerTool:
                 'save_file': save_file
             })
 
+        try:
+            self._launch(pipeline, debug, announce)
+
+            # Watch for exit only after announcing the start
+            self._start_monitor()
+
             return True
 
         except Exception as e:
             logger.error(f"Failed to start GStreamer receiver: {e}")
+            self.is_running = False
             self._notify('gstreamer_error', {'error': str(e)})
             return False
 
-    @staticmethod
-    def check_available() -> bool:
+    @classmethod
+    def check_available(cls) -> bool:
         """Check if GStreamer is available"""
-        try:
-            result = subprocess.run(
-                ['gst-launch-1.0', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+        if cls._avail is None:
+            cls._avail = Gst is not None or shutil.which('gst-launch-1.0') is not None
+        return cls._avail
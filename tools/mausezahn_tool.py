@@ -4,32 +4,248 @@ Mausezahn Tool Wrapper
 Advanced packet generator with VLAN/PCP support for TSN testing
 """
 
+import ctypes
+import ctypes.util
+import fcntl
 import logging
+import os
+import shutil
+import socket
+import struct
 import subprocess
-import threading
+import sys
+import tempfile
 import time
-from typing import Optional, Dict, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Optional, Dict, Callable, Tuple
 import re
 
+from _reaper import Reaper
+from network_manager import network_manager
+from sudo_manager import sudo_manager
+
 logger = logging.getLogger(__name__)
 
+# Worker threads for the native senders, shared by all instances
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='mausezahn')
+
+# mausezahn runs are killed after 5 minutes
+MAUSEZAHN_TIMEOUT = 300
+
+ETH_P_IP = 0x0800
+ETH_P_8021Q = 0x8100
+SIOCGIFADDR = 0x8915
+
+# SO_TXTIME / ETF launch-time scheduling (linux/net_tstamp.h)
+SO_TXTIME = getattr(socket, 'SO_TXTIME', 61)
+SCM_TXTIME = SO_TXTIME
+CLOCK_TAI = getattr(time, 'CLOCK_TAI', 11)
+# Lead time for the first frame; must exceed the etf qdisc delta
+TXTIME_LEAD_NS = 2_000_000
+# How far ahead of the TAI clock frames may be queued
+TXTIME_HORIZON_NS = 20_000_000
+
+# Default frames handed to the kernel per sendmmsg() call. Only used when
+# no inter-packet delay is set: batching sends frames back to back
+SENDMMSG_BATCH = 64
+
+BROADCAST_MAC = 'ff:ff:ff:ff:ff:ff'
+
+# linux/capability.h; mausezahn needs raw sockets
+CAP_NET_RAW = 13
+# security.capability xattr flag: file capabilities are raised at exec
+VFS_CAP_FLAGS_EFFECTIVE = 0x000001
+
+SETCAP_HINT = ("Run `sudo setcap cap_net_raw,cap_net_admin+eip $(which mausezahn)` "
+               "to avoid sudo")
+
+# mausezahn argv pieces for start_vlan_traffic, filled in with str.format_map;
+# 'sudo -n' is prepended at launch when needed
+_MZ_VLAN_HEAD = ('mausezahn', '{iface}', '-Q', '{vlan},{pcp}')
+# Indexed by bool(src_mac) * 2 + bool(dest_mac)
+_MZ_MAC_ARGS = (
+    (),
+    ('-b', '{dmac}'),
+    ('-a', '{smac}'),
+    ('-a', '{smac}', '-b', '{dmac}'),
+)
+_MZ_TYPE_ARGS = {
+    'udp': ('-t', 'udp', 'dp={dport},sp=5000'),
+    'tcp': ('-t', 'tcp', 'dp={dport},sp=5000'),
+    'icmp': ('-t', 'icmp', 'type=8'),
+}
+_MZ_VLAN_TAIL = ('-B', '{dip}', '-P', '{psize}', '-c', '{count}', '-d', '{delay}')
+
+# Complete argv template per (packet_type, MAC variant)
+_MZ_VLAN_TEMPLATES = {
+    (ptype, mac_idx): _MZ_VLAN_HEAD + mac_args + type_args + _MZ_VLAN_TAIL
+    for ptype, type_args in list(_MZ_TYPE_ARGS.items()) + [(None, ())]
+    for mac_idx, mac_args in enumerate(_MZ_MAC_ARGS)
+}
+
+
+class iovec(ctypes.Structure):
+    _fields_ = [
+        ('iov_base', ctypes.c_void_p),
+        ('iov_len', ctypes.c_size_t),
+    ]
+
+
+class msghdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.POINTER(iovec)),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int),
+    ]
+
+
+class mmsghdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_hdr', msghdr),
+        ('msg_len', ctypes.c_uint),
+    ]
+
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    _sendmmsg = _libc.sendmmsg
+    _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(mmsghdr), ctypes.c_uint, ctypes.c_int]
+    _sendmmsg.restype = ctypes.c_int
+except (OSError, AttributeError):
+    _sendmmsg = None
+
+_DELAY_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(nsec|usec|msec|sec|min)?\s*$')
+_DELAY_UNITS_NS = {
+    'nsec': 1,
+    'usec': 1_000,
+    'msec': 1_000_000,
+    'sec': 1_000_000_000,
+    'min': 60_000_000_000,
+}
+
+
+# __slots__ for the stats record where dataclasses support it (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class MausezahnStats:
+    """Statistics of the last run; replaced, never mutated, once reported"""
+    packets_sent: int = 0
+    bytes_sent: int = 0
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    duration: float = 0.0
+
+
+def _parse_delay_ns(delay: str) -> int:
+    """Convert a mausezahn delay string ('1msec', '100usec', ...) to nanoseconds"""
+    match = _DELAY_RE.match(delay)
+    if not match:
+        raise ValueError(f"Invalid delay: {delay}")
+    # mausezahn treats a bare number as microseconds
+    return int(float(match.group(1)) * _DELAY_UNITS_NS[match.group(2) or 'usec'])
+
+
+def _mac_bytes(mac: str) -> bytes:
+    """'aa:bb:cc:dd:ee:ff' -> 6 raw bytes"""
+    raw = bytes.fromhex(mac.replace(':', '').replace('-', ''))
+    if len(raw) != 6:
+        raise ValueError(f"Invalid MAC address: {mac}")
+    return raw
+
+
+def _interface_mac(interface: str) -> str:
+    """Read an interface's MAC address from sysfs"""
+    with open(f'/sys/class/net/{interface}/address') as f:
+        return f.read().strip()
+
+
+def _interface_ipv4(interface: str) -> str:
+    """Look up an interface's primary IPv4 address (SIOCGIFADDR)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        ifreq = fcntl.ioctl(s.fileno(), SIOCGIFADDR, interface[:15].encode().ljust(256, b'\0'))
+    return socket.inet_ntoa(ifreq[20:24])
+
+
+def _arp_lookup(ip: str) -> Optional[str]:
+    """Find the MAC address for an IP in the kernel neighbour (ARP) table"""
+    try:
+        with open('/proc/net/arp') as f:
+            next(f)
+            for line in f:
+                fields = line.split()
+                if fields[0] == ip and fields[3] != '00:00:00:00:00:00':
+                    return fields[3]
+    except (OSError, StopIteration, IndexError):
+        pass
+    return None
+
+
+def _file_has_net_raw(path: str) -> bool:
+    """Check if an executable gains CAP_NET_RAW at exec (setcap ...+ep)"""
+    try:
+        data = os.getxattr(path, 'security.capability')
+    except (OSError, AttributeError):
+        return False
+    if len(data) < 8:
+        return False
+    # struct vfs_cap_data: magic_etc, then permitted/inheritable words
+    magic_etc, permitted = struct.unpack_from('<II', data)
+    return bool(magic_etc & VFS_CAP_FLAGS_EFFECTIVE and permitted & (1 << CAP_NET_RAW))
+
+
+def _ambient_has_net_raw() -> bool:
+    """Check if CAP_NET_RAW is in this process's ambient set (kept across exec)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('CapAmb:'):
+                    return bool(int(line.split()[1], 16) & (1 << CAP_NET_RAW))
+    except (OSError, ValueError, IndexError):
+        pass
+    return False
+
+
+def _ip_checksum(header: bytes) -> int:
+    """RFC 1071 one's-complement checksum"""
+    total = sum(struct.unpack(f'!{len(header) // 2}H', header))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
 
 class MausezahnTool:
     """Wrapper for mausezahn packet generator"""
 
+    # Cached check_available() and _needs_sudo() results
+    _avail: Optional[bool] = None
+    _sudo: Optional[bool] = None
+
     def __init__(self):
         self.running = False
         self.process = None
-        self.thread = None
+        # Set by stop() / the reaper's timeout so the exit of the current
+        # run is not reported as a failure
+        self._stopping = False
+        self._timed_out = False
+        self._future = None
         self.callback = None
+        self._frame_template = b''
+        # Monotonic start of the current run; stats keep wall-clock times
+        # for reporting only
+        self._t0_ns = 0
+        # Live progress of a native run; written only by the sender thread
+        # (once per batch) and read without a lock
+        self._packets_sent = 0
+        self._bytes_sent = 0
 
-        self.stats = {
-            "packets_sent": 0,
-            "bytes_sent": 0,
-            "start_time": None,
-            "end_time": None,
-            "duration": 0
-        }
+        self.stats = MausezahnStats()
 
     def set_callback(self, callback: Callable):
         """Set callback for events"""
@@ -54,7 +270,10 @@ class MausezahnTool:
                           count: int = 1000,
                           delay: str = "1msec",
                           src_mac: Optional[str] = None,
-                          dest_mac: Optional[str] = None) -> bool:
+                          dest_mac: Optional[str] = None,
+                          use_native: bool = False,
+                          txtime: bool = False,
+                          batch_size: int = SENDMMSG_BATCH) -> bool:
         """
         Start VLAN-tagged traffic generation
 
@@ -70,6 +289,15 @@ class MausezahnTool:
             delay: Delay between packets (e.g., '1msec', '100usec')
             src_mac: Source MAC address (optional)
             dest_mac: Destination MAC address (optional)
+            use_native: Send UDP frames from an AF_PACKET socket with
+                sendmmsg() batches instead of running mausezahn
+                (requires CAP_NET_RAW)
+            txtime: With use_native, schedule each frame at a CLOCK_TAI
+                launch time via SO_TXTIME so the etf qdisc (see
+                configure_etf_qdisc) paces frames instead of userland sleeps
+            batch_size: With use_native and no delay, frames per sendmmsg()
+                call. With a delay, frames are always sent one at a time so
+                the inter-packet gap is kept
 
         Returns:
             True if started successfully
@@ -78,53 +306,42 @@ class MausezahnTool:
             logger.warning("Mausezahn already running")
             return False
 
-        try:
-            # Build mausezahn command
-            cmd = ['sudo', 'mausezahn', interface]
-
-            # Add VLAN tag with PCP
-            cmd.extend(['-Q', f'{vlan_id},{pcp}'])
-
-            # Add MAC addresses if provided
-            if src_mac:
-                cmd.extend(['-a', src_mac])
-            if dest_mac:
-                cmd.extend(['-b', dest_mac])
-
-            # Add packet type and parameters
-            if packet_type == 'udp':
-                cmd.extend(['-t', 'udp', f'dp={dest_port},sp=5000'])
-            elif packet_type == 'tcp':
-                cmd.extend(['-t', 'tcp', f'dp={dest_port},sp=5000'])
-            elif packet_type == 'icmp':
-                cmd.extend(['-t', 'icmp', 'type=8'])
-
-            # Add destination IP
-            cmd.extend(['-B', dest_ip])
+        if use_native:
+            if packet_type == 'udp' and _sendmmsg is not None:
+                return self._start_native(interface, dest_ip, vlan_id, pcp, dest_port,
+                                          packet_size, count, delay, src_mac, dest_mac,
+                                          txtime, batch_size)
+            logger.warning("Native sender supports UDP on Linux only, using mausezahn")
 
-            # Add payload size
-            cmd.extend(['-P', str(packet_size)])
-
-            # Add count and delay
-            cmd.extend(['-c', str(count)])
-            cmd.extend(['-d', delay])
+        try:
+            # Build mausezahn command: VLAN tag with PCP, optional MACs,
+            # packet type, destination IP, payload size, count and delay
+            template = _MZ_VLAN_TEMPLATES[(
+                packet_type if packet_type in _MZ_TYPE_ARGS else None,
+                bool(src_mac) * 2 + bool(dest_mac)
+            )]
+            params = {
+                'iface': interface,
+                'vlan': vlan_id,
+                'pcp': pcp,
+                'smac': src_mac,
+                'dmac': dest_mac,
+                'dport': dest_port,
+                'dip': dest_ip,
+                'psize': packet_size,
+                'count': count,
+                'delay': delay,
+            }
+            cmd = [arg.format_map(params) for arg in template]
 
             logger.info(f"Starting mausezahn: {' '.join(cmd)}")
 
-            # Start in background thread
             self.running = True
-            self.stats["start_time"] = time.time()
-            self.stats["packets_sent"] = 0
-            self.stats["bytes_sent"] = 0
-
-            self.thread = threading.Thread(
-                target=self._run_mausezahn,
-                args=(cmd, count, packet_size),
-                daemon=True
-            )
-            self.thread.start()
+            self._t0_ns = time.monotonic_ns()
+            self.stats = replace(self.stats, start_time=time.time(),
+                                 packets_sent=0, bytes_sent=0)
 
-            self._send_event("mausezahn_started", {
+            self._launch_mausezahn(cmd, count, packet_size, {
                 "interface": interface,
                 "vlan_id": vlan_id,
                 "pcp": pcp,
@@ -139,38 +356,274 @@ class MausezahnTool:
             self.running = False
             return False
 
-    def _run_mausezahn(self, cmd: list, count: int, packet_size: int):
-        """Run mausezahn command and track progress"""
+    def _launch_mausezahn(self, cmd: list, count: int, packet_size: int, started: dict):
+        """Start mausezahn; the shared reaper reports completion"""
+        # An absolute executable with close_fds=False lets subprocess use
+        # posix_spawn() instead of fork()+exec(). stderr goes to an
+        # unbounded temp file, read only after exit, for error reporting.
+        if self._needs_sudo():
+            cmd = ['sudo', '-n'] + cmd
+
+        self._stopping = False
+        self._timed_out = False
+        # mausezahn prints no running counter; only a completed run's
+        # count is known
+        self.stats = replace(self.stats, packets_sent=0, bytes_sent=0)
+
+        stderr_file = tempfile.TemporaryFile(mode='w+')
         try:
-            # Run mausezahn
-            result = subprocess.run(
+            self.process = process = subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes max
+                executable=shutil.which(cmd[0]) or cmd[0],
+                close_fds=False,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr_file,
+                text=True
             )
+        except Exception:
+            stderr_file.close()
+            raise
+
+        # Announce the start before watching for exit so a run that ends
+        # immediately cannot report completion first
+        self._send_event("mausezahn_started", started)
+
+        Reaper.register(
+            process,
+            lambda returncode: self._on_mausezahn_exit(process, stderr_file, count,
+                                                       packet_size, returncode),
+            timeout=MAUSEZAHN_TIMEOUT,
+            on_timeout=lambda: self._on_mausezahn_timeout(process)
+        )
+
+    def _on_mausezahn_timeout(self, process: subprocess.Popen):
+        """Reaper callback: process is about to be killed for running too long"""
+        if process is self.process:
+            self._timed_out = True
+
+    def _on_mausezahn_exit(self, process: subprocess.Popen, stderr_file,
+                           count: int, packet_size: int, returncode: int):
+        """Record stats and report the result of a mausezahn run (reaper callback)"""
+        with stderr_file:
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+
+        if process is not self.process:
+            return
+
+        # Update stats; only a run that finished sent the full count
+        end_ns = time.monotonic_ns()
+        self.stats = replace(self.stats,
+                             end_time=time.time(),
+                             duration=(end_ns - self._t0_ns) / 1e9)
+        if returncode == 0 and not self._stopping:
+            self.stats = replace(self.stats, packets_sent=count,
+                                 bytes_sent=count * packet_size)
+        self.running = False
 
-            # Update stats
-            self.stats["end_time"] = time.time()
-            self.stats["duration"] = self.stats["end_time"] - self.stats["start_time"]
-            self.stats["packets_sent"] = count
-            self.stats["bytes_sent"] = count * packet_size
-
-            if result.returncode == 0:
-                logger.info(f"Mausezahn completed: {count} packets sent")
-                self._send_event("mausezahn_complete", self.stats)
-            else:
-                logger.error(f"Mausezahn failed: {result.stderr}")
-                self._send_event("mausezahn_error", {"error": result.stderr})
-
-        except subprocess.TimeoutExpired:
+        if self._stopping:
+            logger.info("Mausezahn stopped before completing")
+            self._send_event("mausezahn_stopped", self.stats)
+        elif returncode == 0:
+            logger.info(f"Mausezahn completed: {count} packets sent")
+            self._send_event("mausezahn_complete", self.stats)
+        elif self._timed_out:
             logger.error("Mausezahn timed out")
             self._send_event("mausezahn_error", {"error": "Timeout"})
+        else:
+            logger.error(f"Mausezahn failed: {stderr}")
+            self._send_event("mausezahn_error", {"error": stderr})
+
+    def _start_native(self,
+                      interface: str,
+                      dest_ip: str,
+                      vlan_id: int,
+                      pcp: int,
+                      dest_port: int,
+                      packet_size: int,
+                      count: int,
+                      delay: str,
+                      src_mac: Optional[str],
+                      dest_mac: Optional[str],
+                      txtime: bool = False,
+                      batch_size: int = SENDMMSG_BATCH) -> bool:
+        """Start the raw-socket sendmmsg() sender in a background thread"""
+        try:
+            if txtime and not self._has_etf_qdisc(interface):
+                raise RuntimeError(f"txtime needs an etf qdisc on {interface}; "
+                                   "install one first (POST /api/mausezahn/etf)")
+
+            delay_ns = _parse_delay_ns(delay)
+            src_mac = src_mac or _interface_mac(interface)
+            dest_mac = dest_mac or _arp_lookup(dest_ip) or BROADCAST_MAC
+            # Built once: every transmitted frame reuses this buffer
+            self._frame_template = frame = self._build_vlan_udp_frame(
+                _mac_bytes(src_mac), _mac_bytes(dest_mac), vlan_id, pcp,
+                _interface_ipv4(interface), dest_ip, 5000, dest_port, packet_size
+            )
+
+            # Protocol 0: transmit only, so received frames are not copied to us
+            sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, 0)
+            sock.bind((interface, 0))
+
+            if txtime:
+                # struct sock_txtime { clockid_t clockid; __u32 flags; }
+                sock.setsockopt(socket.SOL_SOCKET, SO_TXTIME, struct.pack('iI', CLOCK_TAI, 0))
+                # skb priority selects the mqprio traffic class / etf queue
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, pcp)
         except Exception as e:
-            logger.error(f"Mausezahn error: {e}")
+            logger.error(f"Failed to start native sender: {e}")
             self._send_event("mausezahn_error", {"error": str(e)})
+            return False
+
+        logger.info(f"Starting native sender on {interface}: {count} frames of {len(frame)} bytes "
+                    f"to {dest_mac} (VLAN {vlan_id}, PCP {pcp})")
+
+        self.running = True
+        self._stopping = False
+        self._t0_ns = time.monotonic_ns()
+        self._packets_sent = 0
+        self._bytes_sent = 0
+        self.stats = replace(self.stats, start_time=time.time(),
+                             packets_sent=0, bytes_sent=0)
+
+        self._send_event("mausezahn_started", {
+            "interface": interface,
+            "vlan_id": vlan_id,
+            "pcp": pcp,
+            "packet_type": "udp",
+            "count": count,
+            "native": True,
+            "txtime": txtime
+        })
+
+        if txtime:
+            self._future = _executor.submit(self._run_txtime, sock, frame, count,
+                                            packet_size, delay_ns)
+        else:
+            self._future = _executor.submit(self._run_native, sock, frame, count,
+                                            packet_size, delay_ns, batch_size)
+
+        return True
+
+    @staticmethod
+    def _build_vlan_udp_frame(src_mac: bytes, dst_mac: bytes, vlan_id: int, pcp: int,
+                              src_ip: str, dst_ip: str, sport: int, dport: int,
+                              payload_len: int) -> bytes:
+        """
+        Build a complete 802.1Q-tagged Ethernet/IPv4/UDP frame in one pack
+
+        Layout: Ethernet (14) + 802.1Q (4) + IPv4 (20) + UDP (8) + zeroed
+        payload. The UDP checksum is left 0 (not computed, allowed for IPv4).
+        """
+        udp_len = 8 + payload_len
+        src = socket.inet_aton(src_ip)
+        dst = socket.inet_aton(dst_ip)
+
+        # version/IHL, TOS, total length, id, flags=DF, TTL=64, proto=UDP
+        ip_fields = (0x45, 0, 20 + udp_len, 0, 0x4000, 64, socket.IPPROTO_UDP)
+        checksum = _ip_checksum(struct.pack('!BBHHHBBH4s4s', *ip_fields, 0, src, dst))
+
+        return struct.pack(
+            f'!6s6sHHH BBHHHBBH4s4s HHHH {payload_len}x',
+            dst_mac, src_mac, ETH_P_8021Q, (pcp << 13) | vlan_id, ETH_P_IP,
+            *ip_fields, checksum, src, dst,
+            sport, dport, udp_len, 0
+        )
+
+    def _run_native(self, sock: socket.socket, frame: bytes, count: int,
+                    packet_size: int, delay_ns: int, batch_size: int = SENDMMSG_BATCH):
+        """
+        Transmit count copies of frame with sendmmsg()
+
+        Without a delay, frames go out batch_size per call at line rate.
+        mausezahn's delay is a gap between individual packets, so with a
+        delay each frame is sent on its own deadline (start + n * delay);
+        sleeping to absolute deadlines keeps errors from accumulating.
+        """
+        batch = 1 if delay_ns else min(max(batch_size, 1), max(count, 1))
+
+        # One iovec pointing straight at the frame bytes, shared by every
+        # message in the batch (no per-packet copies or allocations)
+        iov = iovec(ctypes.cast(ctypes.c_char_p(frame), ctypes.c_void_p), len(frame))
+        iov_ptr = ctypes.pointer(iov)
+        msgs = (mmsghdr * batch)()
+        for msg in msgs:
+            msg.msg_hdr.msg_iov = iov_ptr
+            msg.msg_hdr.msg_iovlen = 1
+
+        fd = sock.fileno()
+        sent_total = 0
+        error = None
+
+        try:
+            start_ns = time.monotonic_ns()
+            while self.running and sent_total < count:
+                if delay_ns:
+                    wait_ns = start_ns + sent_total * delay_ns - time.monotonic_ns()
+                    if wait_ns > 0:
+                        time.sleep(wait_ns / 1e9)
+
+                want = min(batch, count - sent_total)
+                sent = _sendmmsg(fd, msgs, want, 0)
+                if sent < 0:
+                    err = ctypes.get_errno()
+                    raise OSError(err, os.strerror(err))
+                sent_total += sent
+                self._packets_sent = sent_total
+                self._bytes_sent += sent * packet_size
+        except Exception as e:
+            error = str(e)
         finally:
-            self.running = False
+            sock.close()
+
+        self._finish_native(sent_total, packet_size, error)
+
+    def _run_txtime(self, sock: socket.socket, frame: bytes, count: int,
+                    packet_size: int, delay_ns: int):
+        """Transmit count copies of frame, each tagged with an SCM_TXTIME launch time"""
+        sent_total = 0
+        error = None
+
+        try:
+            txtime_ns = time.clock_gettime_ns(CLOCK_TAI) + TXTIME_LEAD_NS
+            while self.running and sent_total < count:
+                # Keep at most TXTIME_HORIZON_NS of frames queued in the qdisc
+                ahead_ns = txtime_ns - time.clock_gettime_ns(CLOCK_TAI)
+                if ahead_ns > TXTIME_HORIZON_NS:
+                    time.sleep((ahead_ns - TXTIME_HORIZON_NS) / 1e9)
+
+                sock.sendmsg([frame], [(socket.SOL_SOCKET, SCM_TXTIME, struct.pack('Q', txtime_ns))])
+                sent_total += 1
+                self._packets_sent = sent_total
+                self._bytes_sent += packet_size
+                txtime_ns += delay_ns
+        except Exception as e:
+            error = str(e)
+        finally:
+            sock.close()
+
+        self._finish_native(sent_total, packet_size, error)
+
+    def _finish_native(self, sent_total: int, packet_size: int, error: Optional[str]):
+        """Record final stats and report completion of a native run"""
+        end_ns = time.monotonic_ns()
+        self.stats = replace(self.stats,
+                             end_time=time.time(),
+                             duration=(end_ns - self._t0_ns) / 1e9,
+                             packets_sent=sent_total,
+                             bytes_sent=sent_total * packet_size)
+        self.running = False
+
+        if error:
+            logger.error(f"Native sender error: {error}")
+            self._send_event("mausezahn_error", {"error": error})
+        elif self._stopping:
+            logger.info(f"Native sender stopped: {sent_total} packets sent")
+            self._send_event("mausezahn_stopped", self.stats)
+        else:
+            logger.info(f"Native sender completed: {sent_total} packets sent")
+            self._send_event("mausezahn_complete", self.stats)
 
     def start_custom_traffic(self,
                             interface: str,
@@ -198,7 +651,7 @@ class MausezahnTool:
             return False
 
         try:
-            cmd = ['sudo', 'mausezahn', interface]
+            cmd = ['mausezahn', interface]
 
             if vlan_id is not None:
                 cmd.extend(['-Q', f'{vlan_id},{pcp}'])
@@ -210,16 +663,10 @@ class MausezahnTool:
             logger.info(f"Starting custom mausezahn: {' '.join(cmd)}")
 
             self.running = True
-            self.stats["start_time"] = time.time()
+            self._t0_ns = time.monotonic_ns()
+            self.stats = replace(self.stats, start_time=time.time())
 
-            self.thread = threading.Thread(
-                target=self._run_mausezahn,
-                args=(cmd, count, len(packet_hex) // 2),
-                daemon=True
-            )
-            self.thread.start()
-
-            self._send_event("mausezahn_started", {
+            self._launch_mausezahn(cmd, count, len(packet_hex) // 2, {
                 "interface": interface,
                 "vlan_id": vlan_id,
                 "pcp": pcp,
@@ -234,7 +681,9 @@ class MausezahnTool:
             return False
 
     def stop(self):
-        """Stop mausezahn"""
+        """Stop mausezahn; the run is reported as mausezahn_stopped"""
+        if self.running:
+            self._stopping = True
         if self.process:
             try:
                 self.process.terminate()
@@ -245,22 +694,99 @@ class MausezahnTool:
         self.running = False
         logger.info("Mausezahn stopped")
 
-    def get_stats(self) -> dict:
-        """Get current statistics"""
-        return self.stats.copy()
+    @staticmethod
+    def configure_etf_qdisc(interface: str,
+                            pcp: int = 3,
+                            delta_ns: int = 500000,
+                            offload: bool = True) -> Tuple[bool, str]:
+        """
+        Install an mqprio root with an etf child qdisc for SO_TXTIME traffic
+
+        The native sender sets SO_PRIORITY to the frame's PCP, so priority
+        pcp maps to a traffic class of its own on the last TX queue, which
+        gets the etf qdisc; every other priority shares the remaining queues.
+
+        Args:
+            interface: Network interface
+            pcp: Priority (0-7) whose frames are scheduled by etf
+            delta_ns: How long before its launch time a frame is dequeued
+            offload: Use NIC launch-time offload (needs driver support)
+
+        Returns:
+            Tuple of (success, message)
+        """
+        if not 0 <= pcp <= 7:
+            return False, "PCP must be between 0 and 7"
+
+        num_queues = network_manager.get_interface_queues(interface)["num_queues"]
+        if num_queues < 2:
+            return False, f"{interface} needs at least 2 TX queues for mqprio + etf"
+
+        # Traffic class 1 (priority pcp) owns the last queue, class 0 the rest.
+        # mqprio numbers its per-queue classes from 1, so that queue is
+        # 100:<num_queues>.
+        prio_map = ['1' if prio == pcp else '0' for prio in range(16)]
+        commands = [
+            ['tc', 'qdisc', 'replace', 'dev', interface, 'parent', 'root', 'handle', '100',
+             'mqprio', 'num_tc', '2', 'map', *prio_map,
+             'queues', f'{num_queues - 1}@0', f'1@{num_queues - 1}', 'hw', '0'],
+            ['tc', 'qdisc', 'replace', 'dev', interface, 'parent', f'100:{num_queues}',
+             'etf', 'clockid', 'CLOCK_TAI', 'delta', str(delta_ns)] + (['offload'] if offload else [])
+        ]
+
+        for cmd in commands:
+            success, _, stderr = sudo_manager.run_privileged(cmd, timeout=10)
+            if not success:
+                message = f"Failed to configure etf qdisc: {stderr.strip()}"
+                logger.error(message)
+                return False, message
+
+        message = (f"Configured etf qdisc on {interface} queue {num_queues - 1} "
+                   f"for PCP {pcp} (delta {delta_ns} ns)")
+        logger.info(message)
+        return True, message
 
     @staticmethod
-    def check_available() -> bool:
+    def _has_etf_qdisc(interface: str) -> bool:
+        """Check whether an etf qdisc is installed on interface"""
+        qdiscs = network_manager.get_interface_queues(interface).get("qdiscs", [])
+        return any(qdisc["kind"] == "etf" for qdisc in qdiscs)
+
+    def get_stats(self) -> MausezahnStats:
+        """Get current statistics (use dataclasses.asdict() for a dict)"""
+        stats = self.stats
+        if self.running:
+            stats = replace(stats, duration=(time.monotonic_ns() - self._t0_ns) / 1e9)
+            if self._future is not None and not self._future.done():
+                # Native run in progress: report the sender's live counters
+                stats = replace(stats, packets_sent=self._packets_sent,
+                                bytes_sent=self._bytes_sent)
+        return stats
+
+    @classmethod
+    def _needs_sudo(cls) -> bool:
+        """
+        Check if mausezahn has to be started through sudo
+
+        Capabilities in our own effective set are dropped at exec, so only
+        root, an ambient CAP_NET_RAW or a CAP_NET_RAW file capability on
+        the mausezahn binary let it open raw sockets without sudo.
+        """
+        if cls._sudo is None:
+            path = shutil.which('mausezahn')
+            cls._sudo = not (os.geteuid() == 0
+                             or _ambient_has_net_raw()
+                             or (path is not None and _file_has_net_raw(path)))
+            if cls._sudo:
+                logger.info(f"Starting mausezahn through sudo. {SETCAP_HINT}.")
+        return cls._sudo
+
+    @classmethod
+    def check_available(cls) -> bool:
         """Check if mausezahn is available"""
-        try:
-            result = subprocess.run(
-                ['which', 'mausezahn'],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+        if cls._avail is None:
+            cls._avail = shutil.which('mausezahn') is not None
+        return cls._avail
 
 
 if __name__ == "__main__":
@@ -1,89 +1,183 @@
 #!/usr/bin/env python3
 """
 Network Interface Manager
-Provides interface discovery and management capabilities using netifaces and psutil
+Provides interface discovery and management capabilities using netlink and psutil
 """
 
 import logging
+import os
+import re
+import socket
 import subprocess
+import sys
+import threading
+import time
+import ipaddress
 import json
+from dataclasses import asdict, dataclass, field
 from typing import List, Dict, Optional
-import netifaces
 import psutil
 
+from _netlink import IFA_F_TEMPORARY, IFF_UP, RT_SCOPE_LINK, EthtoolNetlink, RouteNetlink, get_drvinfo, prefix_to_netmask
+from sudo_manager import sudo_manager
+
 logger = logging.getLogger(__name__)
 
+# Maximum age of the cached interface list; link/address changes reported
+# over netlink invalidate it sooner, the TTL bounds counter staleness
+INTERFACE_CACHE_TTL = 1.0
+
+# "key: value" lines of ethtool's text output
+_KV_RE = re.compile(r'^\s*([A-Za-z0-9 _\-]+?):\s*(.*?)\s*$')
+# Normalizes ethtool keys ("Auto-negotiation" -> "auto_negotiation")
+_KEY_TBL = str.maketrans(' -', '__')
+
+# `ethtool -k` prints legacy aliases for some features; netlink reports the
+# kernel's ETH_SS_FEATURES names, so the fallback maps onto those
+_ETHTOOL_FEATURE_NAMES = {
+    'rx-checksumming': 'rx-checksum',
+    'udp-fragmentation-offload': 'tx-udp-fragmentation',
+    'generic-segmentation-offload': 'tx-generic-segmentation',
+    'generic-receive-offload': 'rx-gro',
+    'large-receive-offload': 'rx-lro',
+    'rx-vlan-offload': 'rx-vlan-hw-parse',
+    'tx-vlan-offload': 'tx-vlan-hw-insert',
+    'ntuple-filters': 'rx-ntuple-filter',
+    'receive-hashing': 'rx-hashing',
+}
+# Summary lines whose kernel features follow them, indented
+_ETHTOOL_FEATURE_GROUPS = frozenset({'tx-checksumming', 'scatter-gather', 'tcp-segmentation-offload'})
+
+# rtnetlink multicast groups (linux/rtnetlink.h)
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class IfaceInfo:
+    """One discovered interface; rebuilt, never mutated, on refresh"""
+    name: str
+    mac: Optional[str] = None
+    ipv4: Optional[str] = None
+    ipv6: Optional[str] = None
+    netmask: Optional[str] = None
+    status: str = "unknown"
+    mtu: Optional[int] = None
+    speed: Optional[str] = None
+    duplex: Optional[str] = None
+    stats: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        """Plain dict form for JSON responses"""
+        return asdict(self)
+
 
 class NetworkManager:
     """Manages network interfaces and provides detailed interface information"""
 
     def __init__(self):
         self.interfaces = []
+        # Lookup views over self.interfaces, rebuilt with it
+        self._by_name = {}
+        self._active = []
+        # Bumped on every rebuild, so callers can cache views of the list
+        self.generation = 0
+        self._ttl = INTERFACE_CACHE_TTL
+        self._cache_ts = 0.0
+        # Set by the netlink watcher when links or addresses change
+        self._dirty = True
+        self._watcher = None
         self.refresh_interfaces()
 
-    def refresh_interfaces(self) -> List[Dict]:
+    def start(self):
+        """
+        Start the netlink watcher that invalidates the interface cache
+
+        Kept out of __init__ so importing this module starts no threads;
+        without it the cache only expires by INTERFACE_CACHE_TTL.
+        """
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch_netlink,
+                                             name='netlink-watcher', daemon=True)
+            self._watcher.start()
+
+    def _watch_netlink(self):
+        """Invalidate the interface cache on RTNETLINK link/address notifications"""
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+        except (OSError, AttributeError) as e:
+            logger.debug(f"Netlink watcher unavailable, interface cache uses TTL only: {e}")
+            return
+
+        with sock:
+            while True:
+                try:
+                    sock.recv(65536)
+                except OSError:
+                    # ENOBUFS: notifications were dropped, so treat as changed
+                    pass
+                self._dirty = True
+
+    def refresh_interfaces(self, force: bool = False) -> List[IfaceInfo]:
         """
         Refresh and return list of network interfaces with their details
 
+        The list is rebuilt at most once per INTERFACE_CACHE_TTL unless a
+        netlink notification reported a change.
+
+        Args:
+            force: Rebuild even if the cached list is still fresh
+
         Returns:
-            List of interface dictionaries with name, mac, ipv4, ipv6, status, stats
+            List of IfaceInfo records with name, mac, ipv4, ipv6, status, stats
         """
-        self.interfaces = []
+        if not (force or self._dirty) and time.monotonic() - self._cache_ts < self._ttl:
+            return self.interfaces
+
+        # Cleared before rebuilding so a change during the rebuild is kept
+        self._dirty = False
+        self._cache_ts = time.monotonic()
+        interfaces = []
+
+        # Both return every interface; fetch them once per refresh
+        try:
+            all_stats = psutil.net_if_stats()
+            all_io = psutil.net_io_counters(pernic=True)
+        except Exception as e:
+            logger.warning(f"Could not get interface stats: {e}")
+            all_stats = {}
+            all_io = {}
 
-        # Get all interface names
-        interface_names = netifaces.interfaces()
+        # Get all interfaces with their addresses
+        try:
+            discovered = self._discover_netlink()
+        except OSError as e:
+            logger.warning(f"Netlink interface dump failed ({e}), using psutil")
+            discovered = self._discover_psutil(all_stats)
 
-        for iface in interface_names:
+        for iface, addresses in discovered.items():
             # Skip loopback
             if iface == 'lo':
                 continue
 
-            iface_info = {
-                "name": iface,
-                "mac": None,
-                "ipv4": None,
-                "ipv6": None,
-                "netmask": None,
-                "status": "unknown",
-                "mtu": None,
-                "speed": None,
-                "duplex": None,
-                "stats": {}
-            }
-
-            # Get addresses
-            addrs = netifaces.ifaddresses(iface)
-
-            # MAC address
-            if netifaces.AF_LINK in addrs:
-                iface_info["mac"] = addrs[netifaces.AF_LINK][0].get('addr', None)
-
-            # IPv4 address
-            if netifaces.AF_INET in addrs:
-                iface_info["ipv4"] = addrs[netifaces.AF_INET][0].get('addr', None)
-                iface_info["netmask"] = addrs[netifaces.AF_INET][0].get('netmask', None)
-
-            # IPv6 address
-            if netifaces.AF_INET6 in addrs:
-                ipv6_addrs = [addr['addr'] for addr in addrs[netifaces.AF_INET6]]
-                # Filter out link-local addresses
-                global_ipv6 = [addr for addr in ipv6_addrs if not addr.startswith('fe80:')]
-                if global_ipv6:
-                    iface_info["ipv6"] = global_ipv6[0]
+            speed = duplex = None
+            io_stats = {}
 
-            # Get status and stats using psutil
+            # Get link speed and stats using psutil
             try:
-                stats = psutil.net_if_stats().get(iface)
+                stats = all_stats.get(iface)
                 if stats:
-                    iface_info["status"] = "up" if stats.isup else "down"
-                    iface_info["mtu"] = stats.mtu
-                    iface_info["speed"] = f"{stats.speed}Mbps" if stats.speed > 0 else "unknown"
-                    iface_info["duplex"] = self._get_duplex_string(stats.duplex)
+                    speed = f"{stats.speed}Mbps" if stats.speed > 0 else "unknown"
+                    duplex = self._get_duplex_string(stats.duplex)
 
                 # Get I/O counters
-                io_counters = psutil.net_io_counters(pernic=True).get(iface)
+                io_counters = all_io.get(iface)
                 if io_counters:
-                    iface_info["stats"] = {
+                    io_stats = {
                         "bytes_sent": io_counters.bytes_sent,
                         "bytes_recv": io_counters.bytes_recv,
                         "packets_sent": io_counters.packets_sent,
@@ -96,11 +190,90 @@ class NetworkManager:
             except Exception as e:
                 logger.warning(f"Could not get stats for {iface}: {e}")
 
-            self.interfaces.append(iface_info)
+            interfaces.append(IfaceInfo(name=iface, speed=speed, duplex=duplex,
+                                        stats=io_stats, **addresses))
 
+        self._by_name = {iface.name: iface for iface in interfaces}
+        self._active = [iface for iface in interfaces if iface.status == "up"]
+        self.interfaces = interfaces
+        self.generation += 1
         logger.info(f"Found {len(self.interfaces)} network interfaces")
         return self.interfaces
 
+    def _discover_netlink(self) -> Dict[str, Dict]:
+        """
+        Addresses, state and MTU of every interface from one RTM_GETLINK
+        and one RTM_GETADDR dump
+
+        Returns:
+            Interface name -> mac, ipv4, netmask, ipv6, status, mtu
+        """
+        with RouteNetlink() as nl:
+            links = nl.get_links()
+            addrs = nl.get_addrs()
+
+        discovered = {}
+        by_index = {}
+        for link in links:
+            discovered[link.name] = by_index[link.index] = {
+                "mac": link.mac,
+                "ipv4": None,
+                "netmask": None,
+                "ipv6": None,
+                "status": "up" if link.flags & IFF_UP else "down",
+                "mtu": link.mtu
+            }
+
+        for addr in addrs:
+            entry = by_index.get(addr.index)
+            if entry is None:
+                continue
+            if addr.family == socket.AF_INET:
+                # The first address listed is the primary one
+                if entry["ipv4"] is None:
+                    entry["ipv4"] = socket.inet_ntop(addr.family, addr.address)
+                    entry["netmask"] = prefix_to_netmask(addr.prefixlen)
+            elif (entry["ipv6"] is None and addr.scope != RT_SCOPE_LINK
+                  and not addr.flags & IFA_F_TEMPORARY):
+                # Skip link-local and rotating privacy addresses; only the
+                # address actually reported is formatted
+                entry["ipv6"] = socket.inet_ntop(addr.family, addr.address)
+
+        return discovered
+
+    def _discover_psutil(self, all_stats: Dict) -> Dict[str, Dict]:
+        """Fallback for _discover_netlink using socket.if_nameindex and psutil"""
+        all_addrs = psutil.net_if_addrs()
+        discovered = {}
+        for _, iface in socket.if_nameindex():
+            entry = {
+                "mac": None,
+                "ipv4": None,
+                "netmask": None,
+                "ipv6": None
+            }
+
+            for addr in all_addrs.get(iface, []):
+                if addr.family == psutil.AF_LINK:
+                    entry["mac"] = addr.address
+                elif addr.family == socket.AF_INET:
+                    if entry["ipv4"] is None:
+                        entry["ipv4"] = addr.address
+                        entry["netmask"] = addr.netmask
+                elif addr.family == socket.AF_INET6 and entry["ipv6"] is None:
+                    # Filter out link-local addresses (reported as fe80::...%iface)
+                    address = addr.address.split('%', 1)[0]
+                    if not ipaddress.ip_address(address).is_link_local:
+                        entry["ipv6"] = address
+
+            stats = all_stats.get(iface)
+            if stats:
+                entry["status"] = "up" if stats.isup else "down"
+                entry["mtu"] = stats.mtu
+
+            discovered[iface] = entry
+        return discovered
+
     def _get_duplex_string(self, duplex) -> str:
         """Convert psutil duplex constant to string"""
         if duplex == psutil.NIC_DUPLEX_FULL:
@@ -110,21 +283,17 @@ class NetworkManager:
         else:
             return "unknown"
 
-    def get_interface(self, name: str) -> Optional[Dict]:
+    def get_interface(self, name: str) -> Optional[IfaceInfo]:
         """Get specific interface by name"""
-        for iface in self.interfaces:
-            if iface["name"] == name:
-                return iface
-        return None
+        return self._by_name.get(name)
 
-    def get_active_interfaces(self) -> List[Dict]:
+    def get_active_interfaces(self) -> List[IfaceInfo]:
         """Get only interfaces that are up"""
-        return [iface for iface in self.interfaces if iface["status"] == "up"]
+        return self._active
 
     def get_ethtool_info(self, interface: str) -> Dict:
         """
-        Get detailed interface information using ethtool
-        Requires sudo/root privileges
+        Get detailed interface information as reported by ethtool
 
         Args:
             interface: Interface name (e.g., 'enp11s0')
@@ -146,79 +315,82 @@ class NetworkManager:
             "offload": {}
         }
 
+        # Driver info: the ETHTOOL_GDRVINFO ioctl `ethtool -i` issues
         try:
-            # Get driver info
-            result = subprocess.run(
-                ['ethtool', '-i', interface],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            info.update(get_drvinfo(interface))
+        except OSError as e:
+            logger.debug(f"No driver info for {interface}: {e}")
 
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        key = key.strip().lower().replace('-', '_')
-                        value = value.strip()
-
-                        if key == "driver":
-                            info["driver"] = value
-                        elif key == "version":
-                            info["version"] = value
-                        elif key == "firmware_version":
-                            info["firmware"] = value
-                        elif key == "bus_info":
-                            info["bus_info"] = value
+        # Check for TSN capabilities (look for i210, i211, LAN966x, etc.)
+        if info["driver"]:
+            tsn_drivers = ['igb', 'igc', 'lan966x', 'stmmac', 'cpsw']
+            info["tsn_capable"] = any(drv in info["driver"].lower() for drv in tsn_drivers)
 
+        # Link modes, link state and offload features in one netlink round trip
+        try:
+            with EthtoolNetlink() as nl:
+                info.update(nl.get_link_info(interface))
+        except OSError as e:
+            # No ethtool netlink family (kernel before 5.6)
+            logger.debug(f"ethtool netlink unavailable ({e}), running ethtool")
+            self._get_ethtool_link_info(interface, info)
+
+        return info
+
+    def _get_ethtool_link_info(self, interface: str, info: Dict):
+        """Fill in link and offload details by parsing ethtool output"""
+        try:
             # Get link status and speed
             result = subprocess.run(
                 ['ethtool', interface],
-                capture_output=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
                 timeout=5
             )
 
             if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    line = line.strip()
-                    if ':' in line:
-                        parts = line.split(':', 1)
-                        if len(parts) < 2:
-                            continue
-                        key = parts[0].strip().lower().replace(' ', '_')
-                        value = parts[1].strip()
-
-                        if key == "speed":
-                            info["speed"] = value
-                        elif key == "duplex":
-                            info["duplex"] = value
-                        elif key == "auto-negotiation" or key == "auto_negotiation":
-                            info["auto_negotiation"] = value
-                        elif key == "link_detected":
-                            info["link_detected"] = value == "yes"
-
-            # Check for TSN capabilities (look for i210, i211, LAN966x, etc.)
-            if info["driver"]:
-                tsn_drivers = ['igb', 'igc', 'lan966x', 'stmmac', 'cpsw']
-                info["tsn_capable"] = any(drv in info["driver"].lower() for drv in tsn_drivers)
+                for line in result.stdout.splitlines():
+                    match = _KV_RE.match(line)
+                    if not match:
+                        continue
+                    key = match.group(1).lower().translate(_KEY_TBL)
+                    value = match.group(2)
+
+                    if key == "speed":
+                        info["speed"] = value
+                    elif key == "duplex":
+                        info["duplex"] = value
+                    elif key == "auto_negotiation":
+                        info["auto_negotiation"] = value
+                    elif key == "link_detected":
+                        info["link_detected"] = value == "yes"
 
             # Get offload features
             result = subprocess.run(
                 ['ethtool', '-k', interface],
-                capture_output=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
                 timeout=5
             )
 
             if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if ':' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            key = parts[0].strip()
-                            value = parts[1].strip().split()[0]  # Get first word (on/off)
-                            info["offload"][key] = value == "on"
+                for line in result.stdout.splitlines():
+                    match = _KV_RE.match(line)
+                    # Skips the "Features for <iface>:" header
+                    if not match or not match.group(2):
+                        continue
+                    name, value = match.group(1), match.group(2)
+                    if name in _ETHTOOL_FEATURE_GROUPS:
+                        continue
+                    # Like netlink, leave out features that can neither be
+                    # changed nor are active
+                    if value == "off [fixed]":
+                        continue
+                    info["offload"][_ETHTOOL_FEATURE_NAMES.get(name, name)] = value.startswith("on")
 
         except subprocess.TimeoutExpired:
             logger.error(f"ethtool command timed out for {interface}")
@@ -227,17 +399,18 @@ class NetworkManager:
         except Exception as e:
             logger.error(f"Error getting ethtool info for {interface}: {e}")
 
-        return info
-
     def set_interface_state(self, interface: str, state: str, sudo_password: Optional[str] = None) -> bool:
         """
         Bring interface up or down
-        Requires sudo privileges
+
+        Uses netlink directly when the process has CAP_NET_ADMIN, otherwise
+        runs `ip link set` through sudo
 
         Args:
             interface: Interface name
             state: 'up' or 'down'
-            sudo_password: Optional sudo password
+            sudo_password: Optional sudo password; opens a sudo session
+                (see SudoManager) when none is active
 
         Returns:
             True if successful
@@ -247,35 +420,35 @@ class NetworkManager:
             return False
 
         try:
-            cmd = ['sudo', 'ip', 'link', 'set', interface, state]
+            with RouteNetlink() as nl:
+                nl.set_link_up(socket.if_nametoindex(interface), state == 'up')
+            logger.info(f"Interface {interface} set to {state}")
+            return True
+        except PermissionError:
+            logger.debug(f"No CAP_NET_ADMIN to set {interface} {state}, using sudo")
+        except OSError as e:
+            logger.error(f"Failed to set {interface} to {state}: {e}")
+            return False
 
-            if sudo_password:
-                # Use sudo with password
-                process = subprocess.Popen(
-                    ['sudo', '-S'] + cmd[1:],
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                stdout, stderr = process.communicate(input=sudo_password + '\n', timeout=5)
+        try:
+            cmd = ['ip', 'link', 'set', interface, state]
 
-                if process.returncode == 0:
-                    logger.info(f"Interface {interface} set to {state}")
-                    return True
-                else:
-                    logger.error(f"Failed to set {interface} to {state}: {stderr}")
+            if sudo_password and not sudo_manager.is_valid_session():
+                # Open a sudo session, as /api/sudo/auth would
+                verified, message = sudo_manager.set_password(sudo_password)
+                if not verified:
+                    logger.error(f"Failed to set {interface} to {state}: {message}")
                     return False
-            else:
-                # Try without password (user may have NOPASSWD sudo)
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
 
-                if result.returncode == 0:
-                    logger.info(f"Interface {interface} set to {state}")
-                    return True
-                else:
-                    logger.error(f"Failed to set {interface} to {state}: {result.stderr}")
-                    return False
+            # The sudo session's helper, or sudo -n for NOPASSWD users
+            success, _, stderr = sudo_manager.run_privileged(cmd, timeout=5)
+
+            if success:
+                logger.info(f"Interface {interface} set to {state}")
+                return True
+            else:
+                logger.error(f"Failed to set {interface} to {state}: {stderr}")
+                return False
 
         except Exception as e:
             logger.error(f"Error setting interface state: {e}")
@@ -298,48 +471,65 @@ class NetworkManager:
         }
 
         try:
-            # Get queue info using tc
-            result = subprocess.run(
-                ['tc', 'qdisc', 'show', 'dev', interface],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode == 0:
-                info["qdisc_config"] = result.stdout
+            info["qdiscs"] = self._get_qdiscs(interface)
 
-            # Try to get queue count from sysfs
+            # Count the TX queue directories in sysfs
             try:
-                with open(f'/sys/class/net/{interface}/queues', 'r') as f:
-                    # This is a directory, we need to list it
-                    pass
-            except:
-                pass
-
-            # Alternative: use ethtool -l
-            result = subprocess.run(
-                ['ethtool', '-l', interface],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+                with os.scandir(f'/sys/class/net/{interface}/queues') as entries:
+                    info["num_queues"] = sum(1 for entry in entries if entry.name.startswith('tx-'))
+            except OSError:
+                # Alternative: use ethtool -l
+                result = subprocess.run(
+                    ['ethtool', '-l', interface],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    timeout=5
+                )
 
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'TX:' in line and 'Combined:' not in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            try:
-                                info["num_queues"] = int(parts[1].strip())
-                            except:
-                                pass
+                if result.returncode == 0:
+                    # The last TX line is the current setting
+                    for line in result.stdout.splitlines():
+                        match = _KV_RE.match(line)
+                        if match and match.group(1) == 'TX' and match.group(2).isdigit():
+                            info["num_queues"] = int(match.group(2))
 
         except Exception as e:
             logger.error(f"Error getting queue info: {e}")
 
         return info
 
+    def _get_qdiscs(self, interface: str) -> List[Dict]:
+        """Kind, handle, parent and decoded options of each qdisc on interface"""
+        try:
+            index = socket.if_nametoindex(interface)
+            with RouteNetlink() as nl:
+                return [
+                    {"kind": q.kind, "handle": q.handle, "parent": q.parent, "options": q.options}
+                    for q in nl.get_qdiscs(index)
+                ]
+        except OSError as e:
+            logger.debug(f"qdisc dump failed ({e}), running tc")
+
+        # Fallback: tc's JSON output carries the same fields
+        result = subprocess.run(
+            ['tc', '-j', 'qdisc', 'show', 'dev', interface],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=5
+        )
+        if result.returncode != 0 or not result.stdout.strip():
+            return []
+        return [
+            {"kind": q.get("kind"), "handle": q.get("handle"),
+             "parent": "root" if q.get("root") else q.get("parent"),
+             "options": q.get("options", {})}
+            for q in json.loads(result.stdout)
+        ]
+
 
 # Global instance
 network_manager = NetworkManager()
@@ -355,21 +545,21 @@ if __name__ == "__main__":
     interfaces = network_manager.refresh_interfaces()
 
     for iface in interfaces:
-        print(f"\nInterface: {iface['name']}")
-        print(f"  MAC: {iface['mac']}")
-        print(f"  IPv4: {iface['ipv4']}")
-        print(f"  Status: {iface['status']}")
-        print(f"  Speed: {iface['speed']}")
-        print(f"  MTU: {iface['mtu']}")
+        print(f"\nInterface: {iface.name}")
+        print(f"  MAC: {iface.mac}")
+        print(f"  IPv4: {iface.ipv4}")
+        print(f"  Status: {iface.status}")
+        print(f"  Speed: {iface.speed}")
+        print(f"  MTU: {iface.mtu}")
 
-        if iface['stats']:
-            print(f"  RX: {iface['stats']['bytes_recv']:,} bytes, {iface['stats']['packets_recv']:,} packets")
-            print(f"  TX: {iface['stats']['bytes_sent']:,} bytes, {iface['stats']['packets_sent']:,} packets")
+        if iface.stats:
+            print(f"  RX: {iface.stats['bytes_recv']:,} bytes, {iface.stats['packets_recv']:,} packets")
+            print(f"  TX: {iface.stats['bytes_sent']:,} bytes, {iface.stats['packets_sent']:,} packets")
 
     # Test ethtool on first active interface
     active = network_manager.get_active_interfaces()
     if active:
-        iface_name = active[0]['name']
+        iface_name = active[0].name
         print(f"\n\nDetailed info for {iface_name}:")
         print("=" * 80)
 
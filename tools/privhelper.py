@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Privileged Command Helper
+Started once through sudo by SudoManager and runs the commands it is sent,
+so privileged operations do not each pay for a new sudo
+
+Protocol over stdin/stdout, one JSON object per line:
+    request: {"argv": [...], "timeout": seconds}
+    reply:   {"rc": exit code or null, "out": stdout, "err": stderr}
+The helper announces itself with {"ready": true} and exits when stdin closes.
+"""
+
+import json
+import subprocess
+import sys
+
+
+def run(request: dict) -> dict:
+    """Run one requested command"""
+    try:
+        result = subprocess.run(
+            request["argv"],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=request.get("timeout")
+        )
+        return {"rc": result.returncode, "out": result.stdout, "err": result.stderr}
+    except subprocess.TimeoutExpired:
+        return {"rc": None, "out": "", "err": "Command timed out"}
+    except Exception as e:
+        return {"rc": None, "out": "", "err": str(e)}
+
+
+def main():
+    print(json.dumps({"ready": True}), flush=True)
+    for line in sys.stdin:
+        try:
+            reply = run(json.loads(line))
+        except ValueError as e:
+            reply = {"rc": None, "out": "", "err": f"Bad request: {e}"}
+        print(json.dumps(reply), flush=True)
+
+
+if __name__ == "__main__":
+    main()
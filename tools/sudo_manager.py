@@ -4,15 +4,29 @@ Sudo Password Manager
 Secure management of sudo passwords for privileged operations
 """
 
+import json
 import logging
+import os
+import pwd
 import subprocess
+import sys
+import threading
 import time
 from typing import Optional
-import hashlib
 import secrets
 
 logger = logging.getLogger(__name__)
 
+# Check passwords in-process through PAM when python-pam is installed; fall
+# back to spawning sudo otherwise
+try:
+    import pam
+except ImportError:
+    pam = None
+
+# Root helper that runs the privileged commands of one sudo session
+PRIVHELPER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'privhelper.py')
+
 
 class SudoManager:
     """Manages sudo password with security considerations"""
@@ -25,11 +39,16 @@ class SudoManager:
             session_timeout: Session timeout in seconds (default 15 minutes)
         """
         self.session_timeout = session_timeout
+        # bytearray so clear_password can overwrite it in place
         self._password = None
-        self._password_hash = None
         self._last_use_time = None
         self._session_token = None
         self._verified = False
+        self._keep_warm_timer = None
+        # Persistent privileged helper; the lock pairs each request with its reply
+        self._helper = None
+        self._helper_unavailable = False
+        self._helper_lock = threading.Lock()
 
     def set_password(self, password: str) -> tuple[bool, str]:
         """
@@ -41,25 +60,17 @@ class SudoManager:
         Returns:
             Tuple of (success, message)
         """
+        secret = bytearray(password.encode())
         try:
-            # Verify password by running a simple sudo command
-            process = subprocess.Popen(
-                ['sudo', '-S', 'echo', 'test'],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-
-            stdout, stderr = process.communicate(input=password + '\n', timeout=5)
-
-            if process.returncode == 0:
+            if self._verify_password(password, secret):
                 # Password is correct
-                self._password = password
-                self._password_hash = hashlib.sha256(password.encode()).hexdigest()
-                self._last_use_time = time.time()
+                self._wipe()
+                self._password, secret = secret, None
+                self._last_use_time = time.monotonic()
                 self._session_token = secrets.token_hex(16)
                 self._verified = True
+                self._helper_unavailable = False
+                self._schedule_keep_warm()
 
                 logger.info("Sudo password verified and stored")
                 return True, "Password verified successfully"
@@ -73,33 +84,125 @@ class SudoManager:
         except Exception as e:
             logger.error(f"Error verifying sudo password: {e}")
             return False, f"Verification error: {str(e)}"
+        finally:
+            if secret is not None:
+                secret[:] = bytes(len(secret))
+
+    def _verify_password(self, password: str, secret: bytearray) -> bool:
+        """
+        Check the password and cache sudo's credential timestamp
+
+        With python-pam, a wrong password is rejected against sudo's PAM
+        service without spawning sudo. `sudo -S -v` then checks sudoers and
+        refreshes sudo's own timestamp, so commands can run with `sudo -n`.
+        When sudo needs no password (a timestamp still valid from an earlier
+        run, or NOPASSWD), `sudo -n -v` does the same without the password.
+        """
+        if pam is not None:
+            try:
+                # sudo authenticates the real user
+                user = pwd.getpwuid(os.getuid()).pw_name
+                if not pam.pam().authenticate(user, password, service='sudo'):
+                    return False
+            except Exception as e:
+                logger.debug(f"PAM authentication failed to run ({e}), using sudo")
+
+        result = subprocess.run(['sudo', '-n', '-v'], stdin=subprocess.DEVNULL,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=2)
+        if result.returncode == 0:
+            return True
+
+        process = subprocess.Popen(
+            ['sudo', '-S', '-v'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+
+        self._feed_password(process, secret, timeout=5)
+        return process.returncode == 0
+
+    @staticmethod
+    def _feed_password(process: subprocess.Popen, secret: bytearray,
+                       timeout: float) -> tuple[bytes, bytes]:
+        """communicate() the password to sudo -S, wiping the copy written"""
+        line = secret + b'\n'
+        try:
+            return process.communicate(input=line, timeout=timeout)
+        finally:
+            line[:] = bytes(len(line))
+
+    def _wipe(self):
+        """Overwrite the stored password in place"""
+        if self._password is not None:
+            self._password[:] = bytes(len(self._password))
+
+    def _schedule_keep_warm(self):
+        """Refresh sudo's timestamp every half session while the session is valid"""
+        if self._keep_warm_timer is not None:
+            self._keep_warm_timer.cancel()
+        self._keep_warm_timer = threading.Timer(self.session_timeout / 2, self._keep_warm)
+        self._keep_warm_timer.daemon = True
+        self._keep_warm_timer.start()
+
+    def _keep_warm(self):
+        """Timer callback: extend sudo's timestamp, or end an expired session"""
+        if not self.is_valid_session():
+            if self._verified:
+                logger.info("Sudo session expired")
+                self.clear_password()
+            return
+
+        try:
+            subprocess.run(['sudo', '-n', '-v'], stdin=subprocess.DEVNULL,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+        except Exception as e:
+            logger.debug(f"Could not refresh sudo timestamp: {e}")
+        self._schedule_keep_warm()
 
-    def get_password(self) -> Optional[str]:
+    def get_password(self) -> Optional[bytearray]:
         """
         Get stored sudo password if session is still valid
 
         Returns:
-            Password if valid session, None otherwise
+            The password buffer if valid session, None otherwise; it is
+            wiped when the session ends, so do not keep a reference
         """
         if not self._verified or self._password is None:
             return None
 
         # Check session timeout
         if self._last_use_time is not None:
-            elapsed = time.time() - self._last_use_time
+            elapsed = time.monotonic() - self._last_use_time
             if elapsed > self.session_timeout:
                 logger.info("Sudo session expired")
                 self.clear_password()
                 return None
 
         # Update last use time
-        self._last_use_time = time.time()
+        self._last_use_time = time.monotonic()
         return self._password
 
     def clear_password(self):
         """Clear stored password from memory"""
+        if self._keep_warm_timer is not None:
+            self._keep_warm_timer.cancel()
+            self._keep_warm_timer = None
+
+        # The helper runs as root; it must not outlive the session
+        with self._helper_lock:
+            self._stop_helper()
+
+        if self._verified:
+            # Drop sudo's cached credentials along with ours
+            try:
+                subprocess.run(['sudo', '-k'], stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+            except Exception as e:
+                logger.debug(f"Could not reset sudo timestamp: {e}")
+
+        self._wipe()
         self._password = None
-        self._password_hash = None
         self._session_token = None
         self._verified = False
         logger.info("Sudo password cleared from memory")
@@ -110,7 +213,7 @@ class SudoManager:
             return False
 
         if self._last_use_time is not None:
-            elapsed = time.time() - self._last_use_time
+            elapsed = time.monotonic() - self._last_use_time
             if elapsed > self.session_timeout:
                 return False
 
@@ -138,20 +241,41 @@ class SudoManager:
             return False, "", "No valid sudo session. Please authenticate."
 
         try:
-            # Prepare sudo command
-            sudo_cmd = ['sudo', '-S'] + command
+            reply = self._run_in_helper(command, timeout)
+            if reply is not None:
+                returncode, stdout, stderr = reply["rc"], reply["out"], reply["err"]
+                if returncode == 0:
+                    logger.info(f"Sudo command executed successfully: {' '.join(command)}")
+                    return True, stdout, stderr
+                logger.warning(f"Sudo command failed: {' '.join(command)}")
+                return False, stdout, stderr
 
-            process = subprocess.Popen(
-                sudo_cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+            # sudo's timestamp, refreshed by set_password and the keep-warm
+            # timer, lets the command run without passing the password
+            result = subprocess.run(
+                ['sudo', '-n'] + command,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                env=dict(os.environ, LC_MESSAGES='C')
             )
-
-            stdout, stderr = process.communicate(input=password + '\n', timeout=timeout)
-
-            if process.returncode == 0:
+            returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+
+            if returncode != 0 and 'a password is required' in stderr:
+                # No usable timestamp (e.g. timestamp_timeout=0): pass the password
+                process = subprocess.Popen(
+                    ['sudo', '-S'] + command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+                stdout, stderr = self._feed_password(process, password, timeout)
+                stdout = stdout.decode(errors='replace')
+                stderr = stderr.decode(errors='replace')
+                returncode = process.returncode
+
+            if returncode == 0:
                 logger.info(f"Sudo command executed successfully: {' '.join(command)}")
                 return True, stdout, stderr
             else:
@@ -165,6 +289,112 @@ class SudoManager:
             logger.error(f"Error executing sudo command: {e}")
             return False, "", str(e)
 
+    def run_privileged(self, command: list[str], timeout: int = 30) -> tuple[bool, str, str]:
+        """
+        Run a command as root the cheapest way available
+
+        As root the command runs directly. Inside a sudo session it goes
+        through execute_sudo_command, i.e. the persistent helper, so no
+        sudo process is started per command. Without a session, `sudo -n`
+        still covers NOPASSWD users and never waits on a password prompt.
+
+        Args:
+            command: Command to execute as list (without 'sudo')
+            timeout: Command timeout in seconds
+
+        Returns:
+            Tuple of (success, stdout, stderr)
+        """
+        if os.geteuid() != 0 and self.is_valid_session():
+            return self.execute_sudo_command(command, timeout)
+
+        argv = command if os.geteuid() == 0 else ['sudo', '-n'] + command
+        try:
+            result = subprocess.run(
+                argv,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                env=dict(os.environ, LC_MESSAGES='C')
+            )
+        except subprocess.TimeoutExpired:
+            logger.error(f"Privileged command timed out: {' '.join(command)}")
+            return False, "", "Command timed out"
+        except Exception as e:
+            logger.error(f"Error executing privileged command: {e}")
+            return False, "", str(e)
+        return result.returncode == 0, result.stdout, result.stderr
+
+    def _run_in_helper(self, command: list[str], timeout: int) -> Optional[dict]:
+        """
+        Run command through the privileged helper, starting it on first use
+
+        Returns:
+            The helper's reply ({"rc", "out", "err"}), or None if the helper
+            is unavailable
+        """
+        with self._helper_lock:
+            if self._helper is None or self._helper.poll() is not None:
+                if self._helper_unavailable:
+                    return None
+                self._helper = self._start_helper()
+                if self._helper is None:
+                    self._helper_unavailable = True
+                    return None
+
+            try:
+                self._helper.stdin.write(json.dumps({"argv": command, "timeout": timeout}) + "\n")
+                self._helper.stdin.flush()
+                line = self._helper.stdout.readline()
+            except OSError:
+                line = ""
+
+            if not line:
+                logger.warning("Privileged helper exited unexpectedly")
+                self._stop_helper()
+                return None
+            return json.loads(line)
+
+    def _start_helper(self) -> Optional[subprocess.Popen]:
+        """Start privhelper.py through sudo on the cached sudo timestamp"""
+        try:
+            # -n: the password is never written into the helper's stdin
+            helper = subprocess.Popen(
+                ['sudo', '-n', sys.executable, '-u', PRIVHELPER_PATH],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+        except OSError as e:
+            logger.debug(f"Could not start privileged helper: {e}")
+            return None
+
+        if not helper.stdout.readline():
+            helper.wait()
+            logger.info("Privileged helper unavailable (no cached sudo timestamp), "
+                        "running each command through sudo")
+            return None
+
+        logger.info("Privileged helper started")
+        return helper
+
+    def _stop_helper(self):
+        """Stop the privileged helper (caller holds _helper_lock)"""
+        helper, self._helper = self._helper, None
+        if helper is None:
+            return
+
+        try:
+            # Closing stdin ends the helper's request loop
+            helper.stdin.close()
+            helper.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            helper.terminate()
+        helper.stdout.close()
+        logger.info("Privileged helper stopped")
+
     def check_sudo_available(self) -> bool:
         """
         Check if sudo is available on the system
@@ -196,7 +426,7 @@ class SudoManager:
                 "remaining_time": 0
             }
 
-        elapsed = time.time() - self._last_use_time if self._last_use_time else 0
+        elapsed = time.monotonic() - self._last_use_time if self._last_use_time else 0
         remaining = max(0, self.session_timeout - elapsed)
 
         return {